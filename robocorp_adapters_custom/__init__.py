@@ -5,7 +5,7 @@ scalable producer-consumer automation workflows with pluggable backend support.
 
 Supported Adapters:
     - SQLiteAdapter: Local/embedded database backend
-    - RedisAdapter: Distributed Redis backend with clustering support
+    - RedisAdapter: Distributed Redis backend (single server, not Redis Cluster)
     - DocumentDBAdapter: AWS DocumentDB/MongoDB backend
     - YorkoControlRoomAdapter: HTTP REST API adapter for Yorko Control Room
 
@@ -15,19 +15,21 @@ Usage:
     - robocorp_adapters_custom._redis.RedisAdapter
     - robocorp_adapters_custom._docdb.DocumentDBAdapter
     - robocorp_adapters_custom._yorko_control_room.YorkoControlRoomAdapter
-"""
-
-__version__ = "0.1.4"
 
-__all__ = [
-    "exceptions",
-    "workitems_integration",
-]
+    When RC_WORKITEM_ADAPTER names the SQLiteAdapter at import time, the Redis
+    and DocumentDB hooks are skipped entirely: their optional dependencies are
+    not probed, their robocorp.workitems aliases are not registered, and
+    RedisAdapter/DocumentDBAdapter are exported as None.
+"""
 
 # ruff: noqa: E402
 # Note: Module-level imports must occur after attribute injection to ensure
 # drop-in compatibility with robocorp.workitems package
 
+import importlib
+import importlib.abc
+import importlib.util
+import os
 import sys
 
 __version__ = "0.1.4"
@@ -47,7 +49,6 @@ except ImportError:
     robocorp_base = None
 
 # Import our local modules
-from . import _support as _support_module
 from . import _types as _types_module
 from . import _utils as _utils_module
 
@@ -64,85 +65,152 @@ if robocorp_utils is not None:
     if not hasattr(robocorp_utils, 'required_env'):
         robocorp_utils.required_env = _utils_module.required_env
 
-# Map our _support module to robocorp.workitems._adapters._support
-sys.modules.setdefault(
-    "robocorp.workitems._adapters._support", _support_module
-)
-
-# Also provide fallback mappings for our local modules
-sys.modules.setdefault(
-    "robocorp.workitems._types", _types_module
-)
-sys.modules.setdefault(
-    "robocorp.workitems._utils", _utils_module
-)
-
-# T032: Export adapters from robocorp.workitems
-from robocorp.workitems._adapters._base import BaseAdapter
-from robocorp.workitems._exceptions import EmptyQueue
-
-# Import State from our local _types module
-from ._types import State
+# Also provide fallback mappings for our local modules. When robocorp.workitems
+# loaded above, its own modules are already registered and nothing is needed.
+if robocorp_types is None:
+    sys.modules.update(
+        {
+            name: module
+            for name, module in (
+                ("robocorp.workitems._types", _types_module),
+                ("robocorp.workitems._utils", _utils_module),
+            )
+            if name not in sys.modules
+        }
+    )
 
 # Export our custom exception types
 from .exceptions import (
     AdapterError,
     DatabaseTemporarilyUnavailable,
+    CircuitBreakerOpen,
     ConnectionPoolExhausted,
     SchemaVersionMismatch,
 )
 
-from . import _sqlite as _sqlite_module
-
-sys.modules.setdefault(
-    "robocorp.workitems._adapters._sqlite", _sqlite_module
-)
-
-SQLiteAdapter = _sqlite_module.SQLiteAdapter
-
-try:
-    # RedisAdapter is optional for local/dev SQLite runs. Import lazily and
-    # allow the package to be imported even when `redis` is not installed.
-    from . import _redis as _redis_module  # T059
-except Exception:  # pragma: no cover - optional dependency may be missing in some envs
-    RedisAdapter = None
+# Adapter classes are resolved lazily (PEP 562) so that importing the package
+# doesn't pull in optional transport libraries (redis, pymongo) until the
+# corresponding adapter is actually requested.
+_LAZY_ADAPTERS = {
+    "SQLiteAdapter": "_sqlite",
+    "RedisAdapter": "_redis",
+    "DocumentDBAdapter": "_docdb",
+}
+
+# T032/T038-T040: Re-exports resolved on first access. Maps attribute name to
+# (module, attribute); relative modules are resolved against this package.
+_LAZY_ATTRIBUTES = {
+    "BaseAdapter": ("robocorp.workitems._adapters._base", "BaseAdapter"),
+    "EmptyQueue": ("robocorp.workitems._exceptions", "EmptyQueue"),
+    "State": ("._types", "State"),
+    "get_adapter_instance": (".workitems_integration", "get_adapter_instance"),
+    "initialize_adapter": (".workitems_integration", "initialize_adapter"),
+    "load_adapter_class": (".workitems_integration", "load_adapter_class"),
+    "is_custom_adapter_enabled": (".workitems_integration", "is_custom_adapter_enabled"),
+}
+
+# Fast path for SQLite-only processes: skip the Redis/DocumentDB hooks
+_SQLITE_ONLY = os.environ.get("RC_WORKITEM_ADAPTER", "").strip().endswith(".SQLiteAdapter")
+
+if _SQLITE_ONLY:
+    RedisAdapter = DocumentDBAdapter = None
+    _HAS_REDIS = _HAS_DOCDB = False
 else:
-    sys.modules.setdefault(
-        "robocorp.workitems._adapters._redis", _redis_module
-    )
-    RedisAdapter = _redis_module.RedisAdapter
+    # Optional transport libraries are detected without importing them
+    _HAS_REDIS = importlib.util.find_spec("redis") is not None
+    _HAS_DOCDB = importlib.util.find_spec("pymongo") is not None
 
-try:
-    from . import _docdb as _docdb_module
-except Exception:  # pragma: no cover - optional dependency may be missing
-    DocumentDBAdapter = None
-else:
-    sys.modules.setdefault(
-        "robocorp.workitems._adapters._docdb", _docdb_module
-    )
-    DocumentDBAdapter = _docdb_module.DocumentDBAdapter
-
-# T038-T040: Export adapter integration utilities
-from .workitems_integration import (
-    get_adapter_instance,
-    initialize_adapter,
-    load_adapter_class,
-    is_custom_adapter_enabled,
-)
+# Adapter name -> (dependency available, package providing it)
+_OPTIONAL_DEPENDENCIES = {
+    "RedisAdapter": (_HAS_REDIS, "redis"),
+    "DocumentDBAdapter": (_HAS_DOCDB, "pymongo"),
+}
 
-__all__ = [
+__all__ = (
     "BaseAdapter",
     "State",
     "EmptyQueue",
     "AdapterError",
     "DatabaseTemporarilyUnavailable",
+    "CircuitBreakerOpen",
     "ConnectionPoolExhausted",
     "SchemaVersionMismatch",
     "SQLiteAdapter",
-    "RedisAdapter",  # T059 (may be None if redis is not installed)
-    "DocumentDBAdapter",
+    *(("RedisAdapter",) if _HAS_REDIS else ()),  # T059
+    *(("DocumentDBAdapter",) if _HAS_DOCDB else ()),
     "get_adapter_instance",
     "initialize_adapter",
     "load_adapter_class",
     "is_custom_adapter_enabled",
-]
+)
+
+
+class _AliasLoader(importlib.abc.Loader):
+    """Loader that resolves an alias to an already-importable module."""
+
+    def __init__(self, target: str):
+        self._target = target
+
+    def create_module(self, spec):
+        return None  # Use default module creation; replaced in exec_module
+
+    def exec_module(self, module):
+        sys.modules[module.__name__] = importlib.import_module(self._target)
+
+
+class _AdapterAliasFinder(importlib.abc.MetaPathFinder):
+    """Serve ``robocorp.workitems._adapters.*`` names from this package.
+
+    Aliased modules are only imported when the alias itself is imported,
+    instead of being registered in ``sys.modules`` at package import time.
+    """
+
+    def __init__(self, aliases: dict[str, str]):
+        self._aliases = aliases
+
+    def find_spec(self, fullname, path=None, target=None):
+        alias_target = self._aliases.get(fullname)
+        if alias_target is None:
+            return None
+        return importlib.util.spec_from_loader(fullname, _AliasLoader(alias_target))
+
+
+# robocorp.workitems._adapters.* names served from this package on first import
+_ALIASES = {
+    "robocorp.workitems._adapters._support": "robocorp_adapters_custom._support",
+    "robocorp.workitems._adapters._sqlite": "robocorp_adapters_custom._sqlite",
+}
+if not _SQLITE_ONLY:
+    _ALIASES["robocorp.workitems._adapters._redis"] = "robocorp_adapters_custom._redis"
+    _ALIASES["robocorp.workitems._adapters._docdb"] = "robocorp_adapters_custom._docdb"
+
+if not any(isinstance(finder, _AdapterAliasFinder) for finder in sys.meta_path):
+    sys.meta_path.insert(0, _AdapterAliasFinder(_ALIASES))
+
+
+def __getattr__(name: str):
+    target = _LAZY_ATTRIBUTES.get(name)
+    if target is not None:
+        module_name, attribute = target
+        package = __name__ if module_name.startswith(".") else None
+        value = getattr(importlib.import_module(module_name, package), attribute)
+        globals()[name] = value
+        return value
+
+    submodule = _LAZY_ADAPTERS.get(name)
+    if submodule is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    available, package = _OPTIONAL_DEPENDENCIES.get(name, (True, None))
+    if not available:
+        raise AttributeError(
+            f"{name} requires the '{package}' package. Install it with: pip install {package}"
+        )
+
+    adapter_class = getattr(importlib.import_module(f".{submodule}", __name__), name)
+    globals()[name] = adapter_class
+    return adapter_class
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
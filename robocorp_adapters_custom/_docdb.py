@@ -22,39 +22,69 @@ Usage::
         pass
 """
 
-import base64
+import binascii
 import hashlib
+import importlib.util
 import logging
 import os
 import uuid
-from urllib.parse import quote_plus
-from collections.abc import Iterator, MutableMapping
-from datetime import datetime, timedelta
+from collections import OrderedDict
+from collections.abc import Callable, Iterable, Iterator, MutableMapping
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
 from enum import Enum
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, ClassVar, Optional, Union
+from urllib.parse import quote_plus
 
-from robocorp.workitems._exceptions import ApplicationException, EmptyQueue
 from robocorp.workitems._adapters._base import BaseAdapter
+from robocorp.workitems._exceptions import ApplicationException, EmptyQueue
 
 # Import from local modules for drop-in replacement functionality
+from ._support import CircuitBreaker, with_retry
 from ._types import State
 from ._utils import JSONType, required_env
-from ._support import with_retry
+from .exceptions import ConnectionPoolExhausted
 
 LOGGER = logging.getLogger(__name__)
 
+# SIMD base64 codec for legacy (base64) inline file content, when installed
+try:  # pragma: no cover - optional dependency
+    from pybase64 import b64decode as _b64decode
+except ImportError:  # pragma: no cover
+    _b64decode = binascii.a2b_base64
+
+# zstd codec for compressible file content, when installed
+try:  # pragma: no cover - optional dependency
+    import zstandard
+except ImportError:  # pragma: no cover
+    zstandard = None
+
 # Try to import pymongo
 try:  # pragma: no cover - optional dependency
-    from gridfs import GridFS  # type: ignore[import-not-found]
+    from bson import Binary  # type: ignore[import-not-found]
+    from bson.codec_options import CodecOptions  # type: ignore[import-not-found]
+    from bson.raw_bson import RawBSONDocument  # type: ignore[import-not-found]
+    from gridfs import GridFSBucket  # type: ignore[import-not-found]
+    from gridfs.errors import NoFile  # type: ignore[import-not-found]
     from pymongo import (  # type: ignore[import-not-found]
         ASCENDING,
+        IndexModel,
         MongoClient,
         ReturnDocument,
+        WriteConcern,
+    )
+    from pymongo.errors import (  # type: ignore[import-not-found]
+        BulkWriteError,
+        ConfigurationError,
+        WaitQueueTimeoutError,
     )
     from pymongo.errors import (
         ConnectionFailure as _ConnectionFailure,  # type: ignore[import-not-found]
     )
+    from pymongo.errors import (
+        DuplicateKeyError as _DuplicateKeyError,  # type: ignore[import-not-found]
+    )
     from pymongo.errors import (
         OperationFailure as _OperationFailure,  # type: ignore[import-not-found]
     )
@@ -68,10 +98,15 @@ except ImportError:  # pragma: no cover
             "Install it with: pip install robocorp-workitems[docdb]"
         )
 
-    GridFS = _raise_pymongo_import_error  # type: ignore[assignment,misc]
+    Binary = _raise_pymongo_import_error  # type: ignore[assignment,misc]
+    CodecOptions = _raise_pymongo_import_error  # type: ignore[assignment,misc]
+    RawBSONDocument = _raise_pymongo_import_error  # type: ignore[assignment,misc]
+    GridFSBucket = _raise_pymongo_import_error  # type: ignore[assignment,misc]
     MongoClient = _raise_pymongo_import_error  # type: ignore[assignment,misc]
     ReturnDocument = _raise_pymongo_import_error  # type: ignore[assignment,misc]
+    WriteConcern = _raise_pymongo_import_error  # type: ignore[assignment,misc]
     ASCENDING = _raise_pymongo_import_error  # type: ignore[assignment,misc]
+    IndexModel = _raise_pymongo_import_error  # type: ignore[assignment,misc]
 
     class _ConnectionFailure(Exception):  # type: ignore[no-redef]
         """Fallback connection failure when pymongo is unavailable."""
@@ -85,15 +120,73 @@ except ImportError:  # pragma: no cover
         def __init__(self, *args, **kwargs):
             _raise_pymongo_import_error()
 
+    class _DuplicateKeyError(_OperationFailure):  # type: ignore[no-redef]
+        """Fallback duplicate key error when pymongo is unavailable."""
+
+    class BulkWriteError(_OperationFailure):  # type: ignore[no-redef]
+        """Fallback bulk write error when pymongo is unavailable."""
+
+    class ConfigurationError(Exception):  # type: ignore[no-redef]
+        """Fallback configuration error when pymongo is unavailable."""
+
+    class WaitQueueTimeoutError(_ConnectionFailure):  # type: ignore[no-redef]
+        """Fallback pool wait timeout when pymongo is unavailable."""
+
+    class NoFile(Exception):  # type: ignore[no-redef]
+        """Fallback GridFS missing-file error when pymongo is unavailable."""
+
     _pymongo_available = False
 
 
 ConnectionFailure = _ConnectionFailure
 OperationFailure = _OperationFailure
+DuplicateKeyError = _DuplicateKeyError
 
 # File size threshold for GridFS (1MB)
 GRIDFS_THRESHOLD = 1_000_000
 
+# GridFS chunk size (1MiB); the 255KiB default costs 4x the chunk reads
+GRIDFS_CHUNK_SIZE = 1024 * 1024
+
+# Files from this size on are written in larger chunks. Attachments are
+# written once and read whole, so bigger chunks only mean fewer inserts
+GRIDFS_LARGE_FILE_SIZE = 16 * 1024 * 1024
+GRIDFS_LARGE_CHUNK_SIZE = 4 * 1024 * 1024
+
+# Files from this size on are zstd-compressed when zstandard is installed;
+# the compressed form is kept only when it saves at least 10%
+FILE_COMPRESSION_MIN_SIZE = 1024
+FILE_COMPRESSION_LEVEL = 3
+FILE_COMPRESSION_MAX_RATIO = 0.9
+
+# Time budget (seconds) for retrying one operation
+RETRY_MAX_WAIT = 30.0
+
+# Worker threads used by get_files to decode/download attachments
+FILE_READ_WORKERS = 8
+
+# Worker threads used by seed_input_batch to store attachments
+FILE_UPLOAD_WORKERS = 8
+
+# MongoDB error code of a unique index violation
+DUPLICATE_KEY_ERROR_CODE = 11000
+
+# Maximum number of item_id -> queue mappings kept per adapter
+QUEUE_CACHE_SIZE = 10_000
+
+# Full indexes used where partial indexes are unsupported -> partial index
+PARTIAL_INDEX_FALLBACKS = {
+    "callid_idx": "queue_callid_unique_idx",
+    "state_reserved_at_idx": "reserved_at_idx",
+}
+
+# Key of the index serving reservation (filter on queue/state, FIFO sort)
+QUEUE_INDEX_KEYS = [
+    ("queue_name", ASCENDING),
+    ("state", ASCENDING),
+    ("timestamps.created_at", ASCENDING),
+]
+
 
 class ProcessingState(str, Enum):
     """Lifecycle states tracked in DocumentDB collection."""
@@ -108,6 +201,29 @@ class DatabaseTemporarilyUnavailable(ApplicationException):
     """Database is temporarily unavailable."""
 
 
+def _default_compressors() -> str:
+    """Wire compressors to offer, skipping codecs whose library is missing."""
+    codecs = [
+        name
+        for name, module in (("zstd", "zstandard"), ("snappy", "snappy"))
+        if importlib.util.find_spec(module) is not None
+    ]
+    return ",".join([*codecs, "zlib"])
+
+
+def _connection_error(error: Exception) -> Exception:
+    """Map a pymongo connection failure to the exception the adapter raises.
+
+    Pool wait timeouts become ConnectionPoolExhausted so callers fail fast
+    instead of retrying into a saturated pool.
+    """
+    if isinstance(error, WaitQueueTimeoutError):
+        LOGGER.error("MongoDB connection pool exhausted: %s", error)
+        return ConnectionPoolExhausted(f"Connection pool exhausted: {error}")
+    LOGGER.error("MongoDB connection error: %s", error)
+    return DatabaseTemporarilyUnavailable(f"Connection failed: {error}")
+
+
 class DocumentDBAdapter(BaseAdapter):
     """MongoDB/DocumentDB-backed work item adapter.
 
@@ -120,7 +236,13 @@ class DocumentDBAdapter(BaseAdapter):
             "state": "PENDING|RESERVED|COMPLETED|FAILED",
             "payload": {...},
             "files": {
-                "small_file.txt": "base64-content",
+                "<sha1(name)>": {
+                    "name": "small_file.txt",
+                    "storage": "inline",
+                    "encoding": "binary",
+                    "content": Binary(...),
+                    "codec": "zstd",  # only when stored compressed
+                },
                 "large_file.zip": {"gridfs_id": ObjectId(...)}
             },
             "exception": {"type": "...", "code": "...", "message": "..."},
@@ -138,10 +260,22 @@ class DocumentDBAdapter(BaseAdapter):
         RC_WORKITEM_OUTPUT_QUEUE_NAME: Output queue name (optional, default: {queue_name}_output)
         RC_WORKITEM_FILES_DIR: Files directory (default: devdata/work_item_files)
         RC_WORKITEM_ORPHAN_TIMEOUT_MINUTES: Orphan timeout (default: 30)
+        DOCDB_MAX_POOL_SIZE: Maximum pooled connections (default: 200)
+        DOCDB_MIN_POOL_SIZE: Minimum pooled connections (default: 10)
+        DOCDB_MAX_IDLE_TIME_MS: Idle time before a pooled connection closes (default: 300000)
+        DOCDB_WAIT_QUEUE_TIMEOUT_MS: Wait for a free connection (default: 5000)
+        DOCDB_COMPRESSORS: Wire compressors (default: installed of zstd/snappy, then zlib)
+        DOCDB_BREAKER_THRESHOLD: Consecutive failed attempts that open the
+            circuit breaker (default: 5)
+        DOCDB_BREAKER_COOLDOWN: Seconds calls fail fast once it is open (default: 30)
+        DOCDB_GRIDFS_CHUNK_SIZE: GridFS chunk size in bytes (default: 1048576)
 
     lazydocs: ignore
     """
 
+    # (uri, database) pairs whose GridFS indexes were ensured by this process
+    _gridfs_indexed: ClassVar[set[tuple[str, str]]] = set()
+
     def __init__(self):
         """Initialize DocumentDBAdapter.
 
@@ -186,17 +320,67 @@ class DocumentDBAdapter(BaseAdapter):
         self.file_threshold = int(
             os.getenv("RC_WORKITEM_FILE_SIZE_THRESHOLD", str(GRIDFS_THRESHOLD))
         )
+        self.gridfs_chunk_size = int(
+            os.getenv("DOCDB_GRIDFS_CHUNK_SIZE", str(GRIDFS_CHUNK_SIZE))
+        )
+        self.max_pool_size = int(os.getenv("DOCDB_MAX_POOL_SIZE", "200"))
+        self.min_pool_size = int(os.getenv("DOCDB_MIN_POOL_SIZE", "10"))
+        self.max_idle_time_ms = int(os.getenv("DOCDB_MAX_IDLE_TIME_MS", "300000"))
+        self.wait_queue_timeout_ms = int(os.getenv("DOCDB_WAIT_QUEUE_TIMEOUT_MS", "5000"))
+        # Negotiated with the server; set DOCDB_COMPRESSORS="" to disable
+        self.compressors = os.getenv("DOCDB_COMPRESSORS", _default_compressors())
+        # Fail fast for a cooldown window once the database keeps failing
+        self._breaker = CircuitBreaker(
+            threshold=int(os.getenv("DOCDB_BREAKER_THRESHOLD", "5")),
+            cooldown=float(os.getenv("DOCDB_BREAKER_COOLDOWN", "30")),
+        )
 
         # Create files directory
         self.files_dir.mkdir(parents=True, exist_ok=True)
 
+        # Collection wrappers by queue name, see _collection
+        self._collections: dict[str, _CollectionWrapper] = {}
+        # LRU cache of resolved queues to avoid redundant lookups
+        self._queue_cache: OrderedDict[str, str] = OrderedDict()
+        # Reservation command parts are fixed per adapter; pymongo does not
+        # mutate them, so build them once instead of on every reserve_input
+        self._reserve_filter = {
+            "queue_name": self.queue_name,
+            "state": ProcessingState.PENDING.value,
+        }
+        self._reserve_update = {
+            "$set": {"state": ProcessingState.RESERVED.value},
+            # Stamp with the server clock rather than the worker's
+            "$currentDate": {"timestamps.reserved_at": True},
+        }
+        self._reserve_options: dict[str, Any] = {
+            # Only the IDs are needed; don't ship the payload back
+            "projection": {"item_id": 1},
+            "sort": [("timestamps.created_at", ASCENDING)],
+            "return_document": ReturnDocument.AFTER,
+        }
+        # _id of items reserved by this adapter, for release by primary key
+        self._reserved_ids: dict[str, Any] = {}
+        self._closed = False
+        # Cleared if the server is too old for hinted findAndModify
+        self._reserve_hint: Optional[list[tuple[str, Any]]] = QUEUE_INDEX_KEYS
+
+        compression: dict[str, Any] = {}
+        if self.compressors:
+            compression = {"compressors": self.compressors, "zlibCompressionLevel": 6}
+
         # Initialize connection
         try:
             self._client = MongoClient(
                 self.docdb_uri,
                 serverSelectionTimeoutMS=5000,
                 connectTimeoutMS=10000,
-                maxPoolSize=50,
+                maxPoolSize=self.max_pool_size,
+                minPoolSize=self.min_pool_size,
+                maxIdleTimeMS=self.max_idle_time_ms,
+                # Fail fast when every pooled connection is busy
+                waitQueueTimeoutMS=self.wait_queue_timeout_ms,
+                **compression,
             )
 
             # Test connection
@@ -216,40 +400,260 @@ class DocumentDBAdapter(BaseAdapter):
 
     def _init_collections(self):
         """Initialize collections and indexes."""
-        # Create indexes for input queue
-        coll = self._collection()
-        coll.create_index([("item_id", ASCENDING)], unique=True)
-        coll.create_index(
-            [
-                ("queue_name", ASCENDING),
-                ("state", ASCENDING),
-                ("timestamps.created_at", ASCENDING),
+        queue_models = [
+            IndexModel([("item_id", ASCENDING)], unique=True),
+            IndexModel(QUEUE_INDEX_KEYS),
+        ]
+
+        # The collections are independent, so set up their indexes concurrently
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            futures = [
+                executor.submit(self._init_input_indexes, queue_models),
+                executor.submit(
+                    self._ensure_indexes,
+                    self._collection(queue=self.output_queue_name),
+                    queue_models,
+                ),
             ]
-        )
+            gridfs_key = (self.docdb_uri, self.docdb_database)
+            if gridfs_key not in self._gridfs_indexed:
+                futures.append(executor.submit(self._init_gridfs_indexes))
+            for future in futures:
+                future.result()
+            self._gridfs_indexed.add(gridfs_key)
 
-        # Create indexes for output queue
-        output_coll = self._collection(queue=self.output_queue_name)
-        output_coll.create_index([("item_id", ASCENDING)], unique=True)
-        output_coll.create_index(
-            [
-                ("queue_name", ASCENDING),
-                ("state", ASCENDING),
-                ("timestamps.created_at", ASCENDING),
+        # Initialize GridFS
+        self._gridfs = GridFSBucket(self._db, chunk_size_bytes=self.gridfs_chunk_size)
+        # Chunks are only read for their data field: leave them as raw BSON
+        # instead of decoding every chunk into a dict
+        self._gridfs_chunks = self._db.get_collection(
+            "fs.chunks", codec_options=CodecOptions(document_class=RawBSONDocument)
+        )
+        self._gridfs_files = self._db["fs.files"]
+
+    def _init_input_indexes(self, queue_models: list[Any]) -> None:
+        """Create the input queue's indexes, including the partial ones."""
+        partial_models = [
+            # callid is only unique within a queue, and most items have none
+            IndexModel(
+                [("queue_name", ASCENDING), ("callid", ASCENDING)],
+                unique=True,
+                partialFilterExpression={"callid": {"$exists": True}},
+                name="queue_callid_unique_idx",
+            ),
+            # Orphan recovery only looks at reserved items
+            IndexModel(
+                [("timestamps.reserved_at", ASCENDING)],
+                partialFilterExpression={"state": ProcessingState.RESERVED.value},
+                name="reserved_at_idx",
+            ),
+        ]
+        try:
+            self._ensure_indexes(self._collection(), [*queue_models, *partial_models])
+        except OperationFailure as e:
+            LOGGER.warning("Partial indexes unsupported, using full indexes: %s", e)
+            fallback_models = [
+                IndexModel([("callid", ASCENDING)], unique=True, sparse=True, name="callid_idx"),
+                IndexModel(
+                    [("state", ASCENDING), ("timestamps.reserved_at", ASCENDING)],
+                    name="state_reserved_at_idx",
+                ),
             ]
+            self._ensure_indexes(self._collection(), [*queue_models, *fallback_models])
+
+    def _init_gridfs_indexes(self) -> None:
+        """Create GridFS's standard indexes up front.
+
+        GridFS only creates them on the first upload into an empty bucket;
+        without them chunk reads and deletes scan. Runs once per process and
+        database.
+        """
+        self._ensure_indexes(
+            self._db["fs.chunks"],
+            [IndexModel([("files_id", ASCENDING), ("n", ASCENDING)], unique=True)],
+        )
+        self._ensure_indexes(
+            self._db["fs.files"],
+            [IndexModel([("filename", ASCENDING), ("uploadDate", ASCENDING)])],
         )
 
-        # Initialize GridFS
-        self._gridfs = GridFS(self._db)
+    @staticmethod
+    def _ensure_indexes(coll: Any, models: list[Any]) -> None:
+        """Create any missing indexes in a single ``createIndexes`` call.
+
+        Indexes are matched by name, so warm starts cost one
+        ``listIndexes`` round trip and nothing else. A full-index fallback
+        counts as the partial index it replaces.
+        """
+        existing = set(coll.index_information())
+        existing.update(
+            partial for fallback, partial in PARTIAL_INDEX_FALLBACKS.items() if fallback in existing
+        )
+        missing = [model for model in models if model.document["name"] not in existing]
+        if missing:
+            coll.create_indexes(missing)
 
     def _collection(self, queue: Optional[str] = None):
         """Get collection for queue with document post-processing."""
         queue_name = queue or self.queue_name
-        return _CollectionWrapper(self._db[f"{queue_name}_work_items"])
+        coll = self._collections.get(queue_name)
+        if coll is None:
+            # Collections are thread-safe; build each wrapper once
+            coll = self._collections[queue_name] = _CollectionWrapper(
+                self._db[f"{queue_name}_work_items"]
+            )
+        return coll
+
+    def _unacknowledged(self):
+        """Get the input collection with fire-and-forget (w=0) writes."""
+        return self._db[f"{self.queue_name}_work_items"].with_options(
+            write_concern=WriteConcern(w=0)
+        )
 
     @staticmethod
     def _make_file_key(name: str) -> str:
         return hashlib.sha1(name.encode("utf-8")).hexdigest()
 
+    @staticmethod
+    def _legacy_file_key(name: str) -> Optional[str]:
+        """Return the filename key used by legacy entries, if it is a valid path."""
+        if "." in name or name.startswith("$"):
+            return None
+        return name
+
+    def _file_projection(self, names: list[str]) -> dict[str, int]:
+        """Project only the keys the named files can be stored under."""
+        projection = {}
+        for name in names:
+            projection[f"files.{self._make_file_key(name)}"] = 1
+            legacy_key = self._legacy_file_key(name)
+            if legacy_key is not None:
+                projection[f"files.{legacy_key}"] = 1
+        return projection
+
+    def _build_file_entry(self, name: str, content: bytes) -> dict[str, Any]:
+        """Store content and return the file entry to embed in the work item.
+
+        Uses hybrid storage: inline (BSON binary) up to the threshold, GridFS
+        above. Compressible content is stored zstd-compressed and flagged with
+        ``"codec": "zstd"``.
+        """
+        entry: dict[str, Any] = {"name": name}
+        data = self._compress(content)
+        if data is not None:
+            entry["codec"] = "zstd"
+        else:
+            data = content
+
+        if len(content) > self.file_threshold:
+            entry["storage"] = "gridfs"
+            entry["gridfs_id"] = self._gridfs.upload_from_stream(
+                name, data, chunk_size_bytes=self._gridfs_chunk_size_for(len(data))
+            )
+        else:
+            entry["storage"] = "inline"
+            entry["encoding"] = "binary"
+            entry["content"] = Binary(data)
+        return entry
+
+    @staticmethod
+    def _compress(content: bytes) -> Optional[bytes]:
+        """Return zstd-compressed content, or None when it is not worth it."""
+        if zstandard is None or len(content) < FILE_COMPRESSION_MIN_SIZE:
+            return None
+        # Compressor contexts are not thread-safe, so one is made per call
+        compressed = zstandard.ZstdCompressor(level=FILE_COMPRESSION_LEVEL).compress(content)
+        if len(compressed) >= FILE_COMPRESSION_MAX_RATIO * len(content):
+            return None
+        return compressed
+
+    @staticmethod
+    def _decompressor(file_entry: dict[str, Any]) -> Optional[Any]:
+        """Return a zstd decompressor if the entry's content is compressed."""
+        if file_entry.get("codec") != "zstd":
+            return None
+        if zstandard is None:
+            raise ImportError(
+                f"File {file_entry.get('name')} is zstd-compressed. "
+                "Install the zstandard package to read it."
+            )
+        return zstandard.ZstdDecompressor()
+
+    def _build_file_entry_from_path(self, name: str, path: Union[str, Path]) -> dict[str, Any]:
+        """Like ``_build_file_entry``, but streams large files from disk."""
+        source = Path(path)
+        size = source.stat().st_size
+        if size <= self.file_threshold:
+            return self._build_file_entry(name, source.read_bytes())
+        with source.open("rb") as stream:
+            # GridFS reads the stream one chunk at a time
+            file_id = self._gridfs.upload_from_stream(
+                name, stream, chunk_size_bytes=self._gridfs_chunk_size_for(size)
+            )
+        return {"name": name, "storage": "gridfs", "gridfs_id": file_id}
+
+    def _build_upload_entry(self, name: str, content: Union[bytes, Path]) -> dict[str, Any]:
+        """Build a file entry from content in memory or a file on disk."""
+        if isinstance(content, Path):
+            return self._build_file_entry_from_path(name, content)
+        return self._build_file_entry(name, content)
+
+    def _gridfs_chunk_size_for(self, size: int) -> int:
+        """Pick the GridFS chunk size for a file of ``size`` bytes."""
+        if size >= GRIDFS_LARGE_FILE_SIZE:
+            return max(self.gridfs_chunk_size, GRIDFS_LARGE_CHUNK_SIZE)
+        return self.gridfs_chunk_size
+
+    def _read_gridfs(self, file_id: Any) -> bytes:
+        """Read a GridFS file by fetching all of its chunks in one query.
+
+        The streaming reader issues a query per chunk; attachments are bounded
+        in size, so pulling every chunk (sorted by ``n``) in a single cursor
+        avoids those extra round trips.
+        """
+        chunks = self._gridfs_chunks.find({"files_id": file_id}, {"data": 1, "_id": 0}).sort(
+            "n", ASCENDING
+        )
+        data = [chunk["data"] for chunk in chunks]
+        if not data:
+            # Either an empty file or a dangling reference; let GridFS decide
+            return self._gridfs.open_download_stream(file_id).read()
+        return b"".join(data)
+
+    def _delete_gridfs(self, file_id: Any) -> None:
+        """Delete a GridFS file, removing its chunks while the file is deleted.
+
+        GridFSBucket.delete issues the two deletes one after the other; they
+        are independent, so the chunks go on a worker thread.
+
+        Raises:
+            NoFile: No GridFS file with this ID exists
+        """
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            chunks = executor.submit(self._gridfs_chunks.delete_many, {"files_id": file_id})
+            result = self._gridfs_files.delete_one({"_id": file_id})
+            chunks.result()
+        if not result.deleted_count:
+            raise NoFile(f"no file could be deleted because none matched {file_id}")
+
+    def _discard_file_entries(self, entries: Iterable[dict[str, Any]]) -> None:
+        """Delete the GridFS uploads of file entries that were never stored.
+
+        Best effort: a failed delete is logged, so the error that made the
+        entries unreferenced is the one reported to the caller.
+        """
+        for entry in entries:
+            if entry.get("storage") != "gridfs":
+                continue
+            try:
+                self._delete_gridfs(entry["gridfs_id"])
+            except NoFile:
+                pass
+            except (ConnectionFailure, OperationFailure) as e:
+                LOGGER.warning(
+                    "Could not delete orphaned GridFS file %s: %s", entry["gridfs_id"], e
+                )
+
     def _get_file_entry(
         self, doc: dict[str, Any], name: str
     ) -> tuple[str, dict[str, Any]]:
@@ -278,24 +682,64 @@ class DocumentDBAdapter(BaseAdapter):
 
         raise FileNotFoundError(f"File not found: {name}")
 
+    def _cache_item_queue(self, item_id: str, queue_name: str) -> None:
+        """Remember which queue holds the work item, evicting the oldest entry."""
+        self._queue_cache[item_id] = queue_name
+        self._queue_cache.move_to_end(item_id)
+        if len(self._queue_cache) > QUEUE_CACHE_SIZE:
+            self._queue_cache.popitem(last=False)
+
     def _resolve_item_queue(self, item_id: str) -> str:
-        """Find which queue contains the work item."""
-        # Check input queue
-        if self._collection().find_one({"item_id": item_id}):
-            return self.queue_name
+        """Find which queue contains the work item.
+
+        Results are cached, so repeated operations on the same item skip the
+        collection lookups.
+        """
+        queue_name = self._queue_cache.get(item_id)
+        if queue_name is not None:
+            self._queue_cache.move_to_end(item_id)
+            return queue_name
 
+        # Existence checks only need the unique item_id index, not the document
+        # Check input queue
+        if self._collection().find_one({"item_id": item_id}, {"_id": 1}):
+            queue_name = self.queue_name
         # Check output queue
-        if self._collection(queue=self.output_queue_name).find_one(
-            {"item_id": item_id}
+        elif self._collection(queue=self.output_queue_name).find_one(
+            {"item_id": item_id}, {"_id": 1}
         ):
-            return self.output_queue_name
+            queue_name = self.output_queue_name
+        else:
+            raise ValueError(f"Work item not found: {item_id}")
+
+        self._cache_item_queue(item_id, queue_name)
+        return queue_name
 
-        raise ValueError(f"Work item not found: {item_id}")
+    def _find_item(self, item_id: str, projection: dict[str, Any]) -> Optional[dict[str, Any]]:
+        """Fetch a work item, resolving its queue in the same lookup.
+
+        On a cache miss the projected query doubles as the existence check,
+        so a separate queue resolution round trip is not needed.
+        """
+        queue_name = self._queue_cache.get(item_id)
+        if queue_name is not None:
+            self._queue_cache.move_to_end(item_id)
+            return self._collection(queue=queue_name).find_one({"item_id": item_id}, projection)
+
+        for queue_name in (self.queue_name, self.output_queue_name):
+            doc = self._collection(queue=queue_name).find_one({"item_id": item_id}, projection)
+            if doc is not None:
+                self._cache_item_queue(item_id, queue_name)
+                return doc
+        return None
 
     @with_retry(
         max_attempts=3,
         backoff_factor=0.1,
         exceptions=(ConnectionFailure, DatabaseTemporarilyUnavailable),
+        max_wait=RETRY_MAX_WAIT,
+        jitter=True,
+        breaker="_breaker",
     )
     def reserve_input(self) -> str:
         """Reserve next pending work item.
@@ -312,33 +756,43 @@ class DocumentDBAdapter(BaseAdapter):
 
         try:
             coll = self._collection()
-            doc = coll.find_one_and_update(
-                {"queue_name": self.queue_name, "state": ProcessingState.PENDING.value},
-                {
-                    "$set": {
-                        "state": ProcessingState.RESERVED.value,
-                        "timestamps.reserved_at": datetime.utcnow(),
-                    }
-                },
-                sort=[("timestamps.created_at", ASCENDING)],
-                return_document=ReturnDocument.AFTER,
-            )
+            try:
+                doc = coll.find_one_and_update(
+                    self._reserve_filter,
+                    self._reserve_update,
+                    hint=self._reserve_hint,
+                    **self._reserve_options,
+                )
+            except ConfigurationError:
+                # Raised client-side before sending: hinted findAndModify
+                # needs MongoDB 4.4+, which older DocumentDB engines predate
+                LOGGER.info("Server does not support hinted reservations; dropping hint")
+                self._reserve_hint = None
+                doc = coll.find_one_and_update(
+                    self._reserve_filter, self._reserve_update, **self._reserve_options
+                )
 
             if not doc:
                 raise EmptyQueue(f"No work items in queue: {self.queue_name}")
 
             item_id = doc["item_id"]
+            # The reserved item lives in the input queue: record it so the
+            # follow-up payload/file operations resolve it without I/O
+            self._cache_item_queue(item_id, self.queue_name)
+            self._reserved_ids[item_id] = doc["_id"]
             LOGGER.info("Reserved input work item: %s", item_id)
             return item_id
 
         except ConnectionFailure as e:
-            LOGGER.error("MongoDB connection error: %s", e)
-            raise DatabaseTemporarilyUnavailable(f"Connection failed: {e}")
+            raise _connection_error(e)
 
     @with_retry(
         max_attempts=3,
         backoff_factor=0.1,
         exceptions=(ConnectionFailure, DatabaseTemporarilyUnavailable),
+        max_wait=RETRY_MAX_WAIT,
+        jitter=True,
+        breaker="_breaker",
     )
     def release_input(
         self, item_id: str, state: State, exception: Optional[dict] = None
@@ -359,16 +813,18 @@ class DocumentDBAdapter(BaseAdapter):
         try:
             coll = self._collection()
             update: dict[str, dict[str, Any]] = {
-                "$set": {
-                    "state": state.value,
-                    "timestamps.released_at": datetime.utcnow(),
-                }
+                "$set": {"state": state.value},
+                "$currentDate": {"timestamps.released_at": True},
             }
 
             if exception:
                 update["$set"]["exception"] = exception
 
-            coll.update_one({"item_id": item_id}, update)
+            # Reserved here: update by _id; otherwise (e.g. after a
+            # restart) fall back to the item_id index
+            oid = self._reserved_ids.pop(item_id, None)
+            query = {"_id": oid} if oid is not None else {"item_id": item_id}
+            coll.update_one(query, update)
 
             log_func = LOGGER.error if state == State.FAILED else LOGGER.info
             log_func(
@@ -378,13 +834,15 @@ class DocumentDBAdapter(BaseAdapter):
             )
 
         except ConnectionFailure as e:
-            LOGGER.error("MongoDB connection error: %s", e)
-            raise DatabaseTemporarilyUnavailable(f"Connection failed: {e}")
+            raise _connection_error(e)
 
     @with_retry(
         max_attempts=3,
         backoff_factor=0.1,
         exceptions=(ConnectionFailure, DatabaseTemporarilyUnavailable),
+        max_wait=RETRY_MAX_WAIT,
+        jitter=True,
+        breaker="_breaker",
     )
     def create_output(
         self, parent_id: Optional[str], payload: Optional[JSONType] = None
@@ -416,46 +874,300 @@ class DocumentDBAdapter(BaseAdapter):
                 "state": ProcessingState.PENDING.value,
                 "payload": payload_data,
                 "files": {},
-                "timestamps": {"created_at": datetime.utcnow()},
+                "timestamps": {"created_at": datetime.now(timezone.utc)},
             }
             coll.insert_one(doc)
+            self._cache_item_queue(item_id, self.output_queue_name)
 
             LOGGER.info("Created output work item: %s", item_id)
             return item_id
 
         except ConnectionFailure as e:
-            LOGGER.error("MongoDB connection error: %s", e)
-            raise DatabaseTemporarilyUnavailable(f"Connection failed: {e}")
+            raise _connection_error(e)
+
+    def seed_input(
+        self,
+        payload: Optional[JSONType] = None,
+        parent_id: str = "",
+        files: Optional[list[tuple[str, Union[bytes, Path]]]] = None,
+        bulk_mode: bool = False,
+        callid: Optional[str] = None,
+    ) -> str:
+        """Create work item directly in input queue (for testing).
+
+        Files are uploaded and embedded before the document is inserted, so
+        seeding an item with attachments is a single insert instead of one
+        lookup and update per file. Attachments given as a Path are streamed
+        from disk like in ``add_file_from_path``.
+
+        Args:
+            payload: JSON payload data
+            parent_id: Parent work item ID (optional)
+            files: List of (filename, content or Path) tuples (optional)
+            bulk_mode: Skip the write acknowledgement (w=0); insert errors
+                are not reported
+            callid: Caller-supplied ID, unique within the queue (optional)
 
-    def seed_input(self, payload: Optional[JSONType] = None) -> str:
-        """Create work item directly in input queue (for testing)."""
+        Returns:
+            str: New work item ID
+
+        Raises:
+            ValueError: A work item with the same callid already exists
+        """
         item_id = str(uuid.uuid4())
         payload_data = payload if payload is not None else {}
 
+        files = files or []
+        file_keys = [self._make_file_key(name) for name, _ in files]
+        for index, (name, _) in enumerate(files):
+            if file_keys[index] in file_keys[:index]:
+                raise FileExistsError(f"File already exists: {name}")
+
         try:
-            coll = self._collection()
-            doc = {
-                "item_id": item_id,
+            files_doc: dict[str, dict[str, Any]] = {}
+            try:
+                for file_key, (name, content) in zip(file_keys, files, strict=True):
+                    files_doc[file_key] = self._build_upload_entry(name, content)
+
+                coll = self._unacknowledged() if bulk_mode else self._collection()
+                doc = {
+                    "item_id": item_id,
+                    "queue_name": self.queue_name,
+                    "parent_id": parent_id or None,
+                    "state": ProcessingState.PENDING.value,
+                    "payload": payload_data,
+                    "files": files_doc,
+                    "timestamps": {"created_at": datetime.now(timezone.utc)},
+                }
+                if callid is not None:
+                    doc["callid"] = callid
+
+                coll.insert_one(doc)
+            except DuplicateKeyError as e:
+                self._discard_file_entries(files_doc.values())
+                raise ValueError(
+                    f"Work item with callid {callid!r} already exists "
+                    f"in queue: {self.queue_name}"
+                ) from e
+            except Exception:
+                # No document references the uploaded files
+                self._discard_file_entries(files_doc.values())
+                raise
+            self._cache_item_queue(item_id, self.queue_name)
+
+            LOGGER.debug("Seeded input work item: %s", item_id)
+            return item_id
+
+        except ConnectionFailure as e:
+            raise _connection_error(e)
+
+    def seed_input_many(self, payloads: list[Optional[JSONType]]) -> list[str]:
+        """Bulk-create work items in the input queue (for seeding scripts).
+
+        All items are sent in one unordered ``insert_many`` with an
+        unacknowledged write concern (w=0), so insert errors are not reported.
+
+        Args:
+            payloads: JSON payloads, one per work item
+
+        Returns:
+            list[str]: New work item IDs, in payload order
+        """
+        now = datetime.now(timezone.utc)
+        docs = [
+            {
+                "item_id": str(uuid.uuid4()),
                 "queue_name": self.queue_name,
                 "parent_id": None,
                 "state": ProcessingState.PENDING.value,
-                "payload": payload_data,
+                "payload": payload if payload is not None else {},
                 "files": {},
-                "timestamps": {"created_at": datetime.utcnow()},
+                "timestamps": {"created_at": now},
             }
-            coll.insert_one(doc)
+            for payload in payloads
+        ]
+        if not docs:
+            return []
 
-            LOGGER.debug("Seeded input work item: %s", item_id)
-            return item_id
+        try:
+            self._unacknowledged().insert_many(docs, ordered=False)
+        except ConnectionFailure as e:
+            raise _connection_error(e)
+
+        item_ids = [doc["item_id"] for doc in docs]
+        for item_id in item_ids:
+            self._cache_item_queue(item_id, self.queue_name)
+
+        LOGGER.debug("Seeded %d input work items", len(item_ids))
+        return item_ids
+
+    @with_retry(
+        max_attempts=3,
+        backoff_factor=0.1,
+        exceptions=(ConnectionFailure, DatabaseTemporarilyUnavailable),
+        max_wait=RETRY_MAX_WAIT,
+        jitter=True,
+        breaker="_breaker",
+    )
+    def seed_input_batch(
+        self,
+        items: list[tuple[Optional[JSONType], list[tuple[str, Union[bytes, Path]]], Optional[str]]],
+    ) -> list[tuple[Optional[str], Optional[Exception]]]:
+        """Bulk-create work items with files and callids (for seeding scripts).
+
+        Unlike ``seed_input_many``, writes are acknowledged and callids are
+        honoured: callids already in the queue are looked up in one query and
+        skipped, then the remaining items are sent in one unordered
+        ``insert_many``. Attachments are stored concurrently beforehand;
+        attachments given as a Path are streamed from disk like in
+        ``add_file_from_path``.
+
+        Failures are per item: an item listing a filename twice, one whose
+        attachment can't be stored and one rejected by the insert fail on
+        their own while the rest of the batch is seeded. GridFS uploads of
+        items that end up not inserted are deleted again.
+
+        Args:
+            items: (payload, files, callid) tuples, as passed to ``seed_input``
+
+        Returns:
+            list[tuple[Optional[str], Optional[Exception]]]: One (item_id,
+            error) pair per item, in item order: (ID, None) when seeded,
+            (None, None) when skipped because the callid already exists and
+            (None, error) when the item failed
+
+        Raises:
+            DatabaseTemporarilyUnavailable: The callid lookup failed (retried)
+        """
+        results: list[tuple[Optional[str], Optional[Exception]]] = [(None, None)] * len(items)
+        callids = [callid for _, _, callid in items if callid is not None]
+
+        try:
+            existing = set()
+            if callids:
+                existing = {
+                    doc["callid"]
+                    for doc in self._collection().find(
+                        {"queue_name": self.queue_name, "callid": {"$in": callids}},
+                        {"callid": 1, "_id": 0},
+                    )
+                }
+
+            now = datetime.now(timezone.utc)
+            docs: list[dict[str, Any]] = []
+            positions: list[int] = []
+            uploads: list[tuple[int, str, Union[bytes, Path]]] = []
+            for position, (payload, files, callid) in enumerate(items):
+                if callid is not None and callid in existing:
+                    continue
+                names = [name for name, _ in files]
+                if len(set(map(self._make_file_key, names))) != len(names):
+                    results[position] = (
+                        None,
+                        FileExistsError(f"Duplicate filenames in work item: {names}"),
+                    )
+                    continue
+
+                doc = {
+                    "item_id": str(uuid.uuid4()),
+                    "queue_name": self.queue_name,
+                    "parent_id": None,
+                    "state": ProcessingState.PENDING.value,
+                    "payload": payload if payload is not None else {},
+                    "files": {},
+                    "timestamps": {"created_at": now},
+                }
+                if callid is not None:
+                    doc["callid"] = callid
+                    # Later duplicates within the batch are skipped as well
+                    existing.add(callid)
+
+                uploads.extend((len(docs), name, content) for name, content in files)
+                positions.append(position)
+                docs.append(doc)
+
+            # Index in docs -> why that item was not inserted
+            failed: dict[int, Optional[Exception]] = {}
+            if uploads:
+                workers = min(FILE_UPLOAD_WORKERS, len(uploads))
+                with ThreadPoolExecutor(max_workers=workers) as executor:
+                    futures = [
+                        executor.submit(self._build_upload_entry, name, content)
+                        for _, name, content in uploads
+                    ]
+                for (index, name, _), future in zip(uploads, futures, strict=True):
+                    try:
+                        docs[index]["files"][self._make_file_key(name)] = future.result()
+                    except Exception as e:  # fails this item only
+                        failed.setdefault(index, e)
+
+            to_insert = [index for index in range(len(docs)) if index not in failed]
+            if to_insert:
+                try:
+                    self._collection().insert_many(
+                        [docs[index] for index in to_insert], ordered=False
+                    )
+                except BulkWriteError as e:
+                    # Every document without a write error was inserted
+                    for error in e.details.get("writeErrors", []):
+                        index = to_insert[error["index"]]
+                        if error.get("code") == DUPLICATE_KEY_ERROR_CODE:
+                            # Callid inserted concurrently by another seeder
+                            failed[index] = None
+                        else:
+                            failed[index] = OperationFailure(
+                                error.get("errmsg", "Write error"), error.get("code"), error
+                            )
+                except ConnectionFailure as e:
+                    # An unordered insert may have stored part of the batch
+                    item_ids = [docs[index]["item_id"] for index in to_insert]
+                    try:
+                        inserted = {
+                            doc["item_id"]
+                            for doc in self._collection().find(
+                                {"item_id": {"$in": item_ids}}, {"item_id": 1, "_id": 0}
+                            )
+                        }
+                    except ConnectionFailure:
+                        LOGGER.warning(
+                            "Could not tell which of %d work items were inserted; "
+                            "their GridFS files are kept",
+                            len(item_ids),
+                        )
+                        for index in to_insert:
+                            results[positions[index]] = (None, e)
+                        to_insert = []
+                    else:
+                        for index in to_insert:
+                            if docs[index]["item_id"] not in inserted:
+                                failed[index] = e
+
+            for index, error in failed.items():
+                self._discard_file_entries(docs[index]["files"].values())
+                results[positions[index]] = (None, error)
+            for index in to_insert:
+                if index not in failed:
+                    item_id = docs[index]["item_id"]
+                    results[positions[index]] = (item_id, None)
+                    self._cache_item_queue(item_id, self.queue_name)
+
+            LOGGER.debug(
+                "Seeded %d of %d input work items",
+                sum(1 for item_id, _ in results if item_id is not None),
+                len(items),
+            )
+            return results
 
         except ConnectionFailure as e:
-            LOGGER.error("MongoDB connection error: %s", e)
-            raise DatabaseTemporarilyUnavailable(f"Connection failed: {e}")
+            raise _connection_error(e)
 
     @with_retry(
         max_attempts=3,
         backoff_factor=0.1,
         exceptions=(ConnectionFailure, DatabaseTemporarilyUnavailable),
+        max_wait=RETRY_MAX_WAIT,
+        jitter=True,
+        breaker="_breaker",
     )
     def load_payload(self, item_id: str) -> dict:
         """Load JSON payload from work item.
@@ -472,9 +1184,7 @@ class DocumentDBAdapter(BaseAdapter):
         LOGGER.debug("Loading payload for work item: %s", item_id)
 
         try:
-            queue_name = self._resolve_item_queue(item_id)
-            coll = self._collection(queue=queue_name)
-            doc = coll.find_one({"item_id": item_id})
+            doc = self._find_item(item_id, {"payload": 1})
 
             if not doc:
                 raise ValueError(f"Work item not found: {item_id}")
@@ -482,13 +1192,15 @@ class DocumentDBAdapter(BaseAdapter):
             return doc.get("payload", {})
 
         except ConnectionFailure as e:
-            LOGGER.error("MongoDB connection error: %s", e)
-            raise DatabaseTemporarilyUnavailable(f"Connection failed: {e}")
+            raise _connection_error(e)
 
     @with_retry(
         max_attempts=3,
         backoff_factor=0.1,
         exceptions=(ConnectionFailure, DatabaseTemporarilyUnavailable),
+        max_wait=RETRY_MAX_WAIT,
+        jitter=True,
+        breaker="_breaker",
     )
     def save_payload(self, item_id: str, payload: JSONType) -> None:
         """Save JSON payload to work item.
@@ -513,13 +1225,15 @@ class DocumentDBAdapter(BaseAdapter):
                 raise ValueError(f"Work item not found: {item_id}")
 
         except ConnectionFailure as e:
-            LOGGER.error("MongoDB connection error: %s", e)
-            raise DatabaseTemporarilyUnavailable(f"Connection failed: {e}")
+            raise _connection_error(e)
 
     @with_retry(
         max_attempts=3,
         backoff_factor=0.1,
         exceptions=(ConnectionFailure, DatabaseTemporarilyUnavailable),
+        max_wait=RETRY_MAX_WAIT,
+        jitter=True,
+        breaker="_breaker",
     )
     def list_files(self, item_id: str) -> list[str]:
         """List file attachments for work item.
@@ -560,13 +1274,15 @@ class DocumentDBAdapter(BaseAdapter):
             return filenames
 
         except ConnectionFailure as e:
-            LOGGER.error("MongoDB connection error: %s", e)
-            raise DatabaseTemporarilyUnavailable(f"Connection failed: {e}")
+            raise _connection_error(e)
 
     @with_retry(
         max_attempts=3,
         backoff_factor=0.1,
         exceptions=(ConnectionFailure, DatabaseTemporarilyUnavailable),
+        max_wait=RETRY_MAX_WAIT,
+        jitter=True,
+        breaker="_breaker",
     )
     def get_file(self, item_id: str, name: str) -> bytes:
         """Retrieve file content from work item.
@@ -586,48 +1302,182 @@ class DocumentDBAdapter(BaseAdapter):
         LOGGER.debug("Getting file '%s' from work item: %s", name, item_id)
 
         try:
-            queue_name = self._resolve_item_queue(item_id)
-            coll = self._collection(queue=queue_name)
-            doc = coll.find_one({"item_id": item_id})
+            file_entry = self._load_file_entry(item_id, name)
+            return self._read_file_entry(item_id, file_entry)
 
-            if doc is None:
-                raise ValueError(f"Work item not found: {item_id}")
+        except ConnectionFailure as e:
+            raise _connection_error(e)
 
+    @with_retry(
+        max_attempts=3,
+        backoff_factor=0.1,
+        exceptions=(ConnectionFailure, DatabaseTemporarilyUnavailable),
+        max_wait=RETRY_MAX_WAIT,
+        jitter=True,
+        breaker="_breaker",
+    )
+    def get_file_to_path(self, item_id: str, name: str, dest_path: Union[str, Path]) -> Path:
+        """Write file content from work item to disk.
+
+        GridFS content is streamed chunk by chunk into the destination, so
+        large files are never held in memory as a whole.
+
+        Args:
+            item_id: Work item ID
+            name: Filename
+            dest_path: Path to write the content to
+
+        Returns:
+            Path: The destination path
+
+        Raises:
+            FileNotFoundError: File not found
+        """
+        LOGGER.debug("Saving file '%s' from work item %s to %s", name, item_id, dest_path)
+
+        dest = Path(dest_path)
+        try:
+            file_entry = self._load_file_entry(item_id, name)
+            gridfs_id = file_entry.get("gridfs_id")
+            if file_entry.get("storage") != "gridfs" or gridfs_id is None:
+                dest.write_bytes(self._read_file_entry(item_id, file_entry))
+                return dest
+
+            decompressor = self._decompressor(file_entry)
             try:
-                _, file_entry = self._get_file_entry(doc, name)
+                with dest.open("wb") as stream:
+                    if decompressor is None:
+                        self._gridfs.download_to_stream(gridfs_id, stream)
+                    else:
+                        with decompressor.stream_writer(stream, closefd=False) as writer:
+                            self._gridfs.download_to_stream(gridfs_id, writer)
+            except BaseException:
+                dest.unlink(missing_ok=True)
+                raise
+            return dest
+
+        except ConnectionFailure as e:
+            raise _connection_error(e)
+
+    def _load_file_entry(self, item_id: str, name: str) -> dict[str, Any]:
+        """Fetch the work item and return the entry for one of its files."""
+        return self._load_file_entries(item_id, [name])[name]
+
+    def _load_file_entries(
+        self, item_id: str, names: Optional[list[str]] = None
+    ) -> dict[str, dict[str, Any]]:
+        """Fetch the entries for the named (default: all) files of a work item.
+
+        Only the keys the named files are stored under are projected; the
+        whole files map is read only if an entry is not found under them.
+        """
+        queue_name = self._resolve_item_queue(item_id)
+        coll = self._collection(queue=queue_name)
+        if names is None:
+            doc = coll.find_one({"item_id": item_id}, {"files": 1})
+        else:
+            doc = coll.find_one({"item_id": item_id}, self._file_projection(names))
+
+        if doc is None:
+            raise ValueError(f"Work item not found: {item_id}")
+
+        if names is None:
+            names = list(doc.get("files") or {})
+        elif not all(name in (doc.get("files") or {}) for name in names):
+            doc = coll.find_one({"item_id": item_id}, {"files": 1}) or doc
+
+        entries = {}
+        for name in names:
+            try:
+                entries[name] = self._get_file_entry(doc, name)[1]
             except FileNotFoundError as exc:
                 raise FileNotFoundError(
                     f"File not found: {name} (work item: {item_id})"
                 ) from exc
+        return entries
 
-            storage = file_entry.get("storage")
-            if storage == "gridfs":
-                gridfs_id = file_entry.get("gridfs_id")
-                if gridfs_id is None:
-                    raise FileNotFoundError(
-                        f"GridFS reference missing for file: {name} (work item: {item_id})"
-                    )
-                gridfs_file = self._gridfs.get(gridfs_id)
-                return gridfs_file.read()
+    @with_retry(
+        max_attempts=3,
+        backoff_factor=0.1,
+        exceptions=(ConnectionFailure, DatabaseTemporarilyUnavailable),
+        max_wait=RETRY_MAX_WAIT,
+        jitter=True,
+        breaker="_breaker",
+    )
+    def get_files(self, item_id: str, names: Optional[list[str]] = None) -> dict[str, bytes]:
+        """Retrieve several files from a work item at once.
 
-            if storage == "inline":
-                encoded = file_entry.get("content")
-                if encoded is None:
-                    raise FileNotFoundError(
-                        f"Inline content missing for file: {name} (work item: {item_id})"
+        The work item is fetched once; inline decoding and GridFS downloads
+        then run concurrently on a thread pool.
+
+        Args:
+            item_id: Work item ID
+            names: Filenames to fetch (default: all attached files)
+
+        Returns:
+            dict[str, bytes]: File content keyed by filename
+
+        Raises:
+            FileNotFoundError: A requested file was not found
+        """
+        LOGGER.debug("Getting files %s from work item: %s", names, item_id)
+
+        try:
+            file_entries = self._load_file_entries(item_id, names)
+            names = list(file_entries)
+            entries = list(file_entries.values())
+
+            if len(entries) <= 1:
+                contents = [self._read_file_entry(item_id, entry) for entry in entries]
+            else:
+                workers = min(FILE_READ_WORKERS, len(entries))
+                with ThreadPoolExecutor(max_workers=workers) as executor:
+                    contents = list(
+                        executor.map(lambda entry: self._read_file_entry(item_id, entry), entries)
                     )
-                return base64.b64decode(encoded)
 
-            raise FileNotFoundError(f"File not found: {name} (work item: {item_id})")
+            return dict(zip(names, contents, strict=True))
 
         except ConnectionFailure as e:
-            LOGGER.error("MongoDB connection error: %s", e)
-            raise DatabaseTemporarilyUnavailable(f"Connection failed: {e}")
+            raise _connection_error(e)
+
+    def _read_file_entry(self, item_id: str, file_entry: dict[str, Any]) -> bytes:
+        """Return the content referenced by a resolved file entry."""
+        name = file_entry.get("name")
+        storage = file_entry.get("storage")
+        if storage == "gridfs":
+            gridfs_id = file_entry.get("gridfs_id")
+            if gridfs_id is None:
+                raise FileNotFoundError(
+                    f"GridFS reference missing for file: {name} (work item: {item_id})"
+                )
+            data = self._read_gridfs(gridfs_id)
+        elif storage == "inline":
+            content = file_entry.get("content")
+            if content is None:
+                raise FileNotFoundError(
+                    f"Inline content missing for file: {name} (work item: {item_id})"
+                )
+            if file_entry.get("encoding") == "binary":
+                data = bytes(content)
+            else:
+                # Entries written before binary storage hold base64 text
+                data = _b64decode(content)
+        else:
+            raise FileNotFoundError(f"File not found: {name} (work item: {item_id})")
+
+        decompressor = self._decompressor(file_entry)
+        if decompressor is not None:
+            return decompressor.decompress(data)
+        return data
 
     @with_retry(
         max_attempts=3,
         backoff_factor=0.1,
         exceptions=(ConnectionFailure, DatabaseTemporarilyUnavailable),
+        max_wait=RETRY_MAX_WAIT,
+        jitter=True,
+        breaker="_breaker",
     )
     def add_file(self, item_id: str, name: str, content: bytes) -> None:
         """Attach file to work item.
@@ -647,58 +1497,81 @@ class DocumentDBAdapter(BaseAdapter):
         )
 
         try:
-            queue_name = self._resolve_item_queue(item_id)
-            coll = self._collection(queue=queue_name)
-            doc = coll.find_one({"item_id": item_id})
+            self._attach_file(item_id, name, lambda: self._build_file_entry(name, content))
 
-            if not doc:
-                raise ValueError(f"Work item not found: {item_id}")
+        except ConnectionFailure as e:
+            raise _connection_error(e)
 
-            files_field = doc.get("files")
-            if isinstance(files_field, _FilesView):
-                if name in files_field:
-                    raise FileExistsError(f"File already exists: {name}")
-            else:
-                files_dict = files_field or {}
-                if not isinstance(files_dict, dict):
-                    files_dict = {}
-
-                if any(
-                    (entry.get("name") == name)
-                    if isinstance(entry, dict)
-                    else key == name
-                    for key, entry in files_dict.items()
-                ):
-                    raise FileExistsError(f"File already exists: {name}")
+    @with_retry(
+        max_attempts=3,
+        backoff_factor=0.1,
+        exceptions=(ConnectionFailure, DatabaseTemporarilyUnavailable),
+        max_wait=RETRY_MAX_WAIT,
+        jitter=True,
+        breaker="_breaker",
+    )
+    def add_file_from_path(self, item_id: str, name: str, path: Union[str, Path]) -> None:
+        """Attach a file from disk to work item.
 
-            file_key = self._make_file_key(name)
-            if len(content) > self.file_threshold:
-                gridfs_id = self._gridfs.put(content, filename=name)
-                file_entry = {
-                    "name": name,
-                    "storage": "gridfs",
-                    "gridfs_id": gridfs_id,
-                }
-            else:
-                file_entry = {
-                    "name": name,
-                    "storage": "inline",
-                    "content": base64.b64encode(content).decode("utf-8"),
-                }
+        Files above the inline threshold are streamed into GridFS chunk by
+        chunk, so their content is never held in memory as a whole.
 
-            coll.update_one(
-                {"item_id": item_id},
-                {"$set": {f"files.{file_key}": file_entry}},
-            )
+        Args:
+            item_id: Work item ID
+            name: Filename
+            path: Path of the file to attach
+
+        Raises:
+            FileExistsError: File already exists
+        """
+        LOGGER.debug("Adding file '%s' to work item %s from %s", name, item_id, path)
+
+        try:
+            self._attach_file(item_id, name, lambda: self._build_file_entry_from_path(name, path))
 
         except ConnectionFailure as e:
-            LOGGER.error("MongoDB connection error: %s", e)
-            raise DatabaseTemporarilyUnavailable(f"Connection failed: {e}")
+            raise _connection_error(e)
+
+    def _attach_file(
+        self, item_id: str, name: str, build_entry: Callable[[], dict[str, Any]]
+    ) -> None:
+        """Store a file and embed its entry unless the name is already taken.
+
+        The duplicate check is part of the update filter, so a successful
+        attach is a single round trip.
+        """
+        queue_name = self._resolve_item_queue(item_id)
+        coll = self._collection(queue=queue_name)
+        file_key = self._make_file_key(name)
+
+        query: dict[str, Any] = {"item_id": item_id, f"files.{file_key}": {"$exists": False}}
+        legacy_key = self._legacy_file_key(name)
+        if legacy_key is not None:
+            # Legacy entries were keyed by the filename itself
+            query[f"files.{legacy_key}"] = {"$exists": False}
+
+        file_entry = build_entry()
+        result = coll.update_one(query, {"$set": {f"files.{file_key}": file_entry}})
+        if result.matched_count:
+            return
+
+        # Nothing was attached: drop the uploaded content, then report why
+        if file_entry.get("storage") == "gridfs":
+            try:
+                self._delete_gridfs(file_entry["gridfs_id"])
+            except NoFile:
+                pass
+        if coll.find_one({"item_id": item_id}, {"_id": 1}) is None:
+            raise ValueError(f"Work item not found: {item_id}")
+        raise FileExistsError(f"File already exists: {name}")
 
     @with_retry(
         max_attempts=3,
         backoff_factor=0.1,
         exceptions=(ConnectionFailure, DatabaseTemporarilyUnavailable),
+        max_wait=RETRY_MAX_WAIT,
+        jitter=True,
+        breaker="_breaker",
     )
     def remove_file(self, item_id: str, name: str) -> None:
         """Remove file from work item.
@@ -717,38 +1590,60 @@ class DocumentDBAdapter(BaseAdapter):
         try:
             queue_name = self._resolve_item_queue(item_id)
             coll = self._collection(queue=queue_name)
-            doc = coll.find_one({"item_id": item_id})
 
-            if doc is None:
-                raise ValueError(f"Work item not found: {item_id}")
+            # Unset the entry and get it back (for its GridFS reference) in
+            # one round trip
+            file_key = self._make_file_key(name)
+            doc = coll.find_one_and_update(
+                {"item_id": item_id, f"files.{file_key}": {"$exists": True}},
+                {"$unset": {f"files.{file_key}": ""}},
+                projection={f"files.{file_key}": 1},
+                return_document=ReturnDocument.BEFORE,
+            )
+            if doc is not None:
+                _, file_entry = self._get_file_entry(doc, name)
+            else:
+                # Not under its hashed key: a legacy entry, or no such file
+                doc = coll.find_one({"item_id": item_id})
 
-            try:
-                file_key, file_entry = self._get_file_entry(doc, name)
-            except FileNotFoundError as exc:
-                raise FileNotFoundError(
-                    f"File not found: {name} (work item: {item_id})"
-                ) from exc
+                if doc is None:
+                    raise ValueError(f"Work item not found: {item_id}")
+
+                try:
+                    file_key, file_entry = self._get_file_entry(doc, name)
+                except FileNotFoundError as exc:
+                    raise FileNotFoundError(
+                        f"File not found: {name} (work item: {item_id})"
+                    ) from exc
+
+                coll.update_one({"item_id": item_id}, {"$unset": {f"files.{file_key}": ""}})
 
             storage = file_entry.get("storage")
             if storage is None and "gridfs_id" in file_entry:
                 storage = "gridfs"
 
-            if storage == "gridfs" and "gridfs_id" in file_entry:
-                self._gridfs.delete(file_entry["gridfs_id"])
-
-            coll.update_one({"item_id": item_id}, {"$unset": {f"files.{file_key}": ""}})
-
         except ConnectionFailure as e:
-            LOGGER.error("MongoDB connection error: %s", e)
-            raise DatabaseTemporarilyUnavailable(f"Connection failed: {e}")
+            raise _connection_error(e)
+
+        if storage == "gridfs" and "gridfs_id" in file_entry:
+            gridfs_id = file_entry["gridfs_id"]
+            try:
+                self._delete_gridfs(gridfs_id)
+            except NoFile:
+                LOGGER.warning("GridFS file already gone: %s", gridfs_id)
+            except ConnectionFailure as e:
+                # The entry is already unset, so retrying the removal would only
+                # report FileNotFoundError; leave the content for a later sweep
+                LOGGER.warning("Orphaned GridFS file %s of %s: %s", gridfs_id, name, e)
 
     def recover_orphaned_work_items(self) -> list[str]:
         """Recover orphaned work items beyond timeout.
 
         Returns:
-            list[str]: List of recovered work item IDs
+            list[str]: List of recovered work item IDs (an item released
+                between the lookup and the update is listed but left as is)
         """
-        cutoff_time = datetime.utcnow() - timedelta(minutes=self.orphan_timeout_minutes)
+        cutoff_time = datetime.now(timezone.utc) - timedelta(minutes=self.orphan_timeout_minutes)
 
         LOGGER.info(
             "Recovering orphaned work items (timeout: %d min)",
@@ -757,11 +1652,18 @@ class DocumentDBAdapter(BaseAdapter):
 
         try:
             coll = self._collection()
+            query: dict[str, Any] = {
+                "state": ProcessingState.RESERVED.value,
+                "timestamps.reserved_at": {"$lt": cutoff_time},
+            }
+            # update_many doesn't report which documents it touched, so
+            # collect the IDs first: two round trips however many orphans
+            orphan_ids = [doc["item_id"] for doc in coll.find(query, {"item_id": 1, "_id": 0})]
+            if not orphan_ids:
+                return []
+
             result = coll.update_many(
-                {
-                    "state": ProcessingState.RESERVED.value,
-                    "timestamps.reserved_at": {"$lt": cutoff_time},
-                },
+                {**query, "item_id": {"$in": orphan_ids}},
                 {
                     "$set": {"state": ProcessingState.PENDING.value},
                     "$unset": {"timestamps.reserved_at": ""},
@@ -773,11 +1675,27 @@ class DocumentDBAdapter(BaseAdapter):
                     "Recovered %d orphaned work items", result.modified_count
                 )
 
-            return []  # DocumentDB doesn't easily return affected IDs
+            return orphan_ids
 
         except ConnectionFailure as e:
-            LOGGER.error("MongoDB connection error: %s", e)
-            raise DatabaseTemporarilyUnavailable(f"Connection failed: {e}")
+            raise _connection_error(e)
+
+    def close(self) -> None:
+        """Close the client connection pool. Safe to call more than once."""
+        if self._closed:
+            return
+        self._closed = True
+        self._collections.clear()
+        self._queue_cache.clear()
+        self._reserved_ids.clear()
+        self._client.close()
+        LOGGER.debug("DocumentDBAdapter closed: db=%s", self.docdb_database)
+
+    def __enter__(self) -> "DocumentDBAdapter":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
 
     @property
     def _config(self) -> "_Config":
@@ -823,9 +1741,17 @@ class _FilesView(MutableMapping[str, Any]):
         _, entry = self.resolve(key)
         storage = entry.get("storage")
         if storage == "gridfs":
-            return {"gridfs_id": entry.get("gridfs_id")}
+            ref = {"gridfs_id": entry.get("gridfs_id")}
+            if "codec" in entry:
+                # The GridFS file holds the compressed bytes
+                ref["codec"] = entry["codec"]
+            return ref
         if storage == "inline":
-            return entry.get("content")
+            content = entry.get("content")
+            decompressor = DocumentDBAdapter._decompressor(entry)
+            if decompressor is not None and content is not None:
+                return decompressor.decompress(bytes(content))
+            return content
         return entry
 
     def __setitem__(
@@ -4,11 +4,12 @@ This module implements a custom work item adapter using Redis as the backend.
 Perfect for distributed processing with multiple parallel workers.
 
 Features:
-- Atomic queue operations using RPOPLPUSH
+- Atomic queue operations using RPOPLPUSH and Lua scripts
 - Hybrid file storage (inline <1MB, filesystem >1MB)
 - Connection pooling with health checks
 - Orphaned work item recovery
-- Support for Redis Cluster and Sentinel
+- Single-server deployments (Redis Cluster is not supported: queue
+  operations span keys in different hash slots)
 
 Usage:
     from robocorp.workitems import Inputs
@@ -23,15 +24,21 @@ Usage:
         pass
 """
 
-import base64
+import binascii
+import functools
 import json
 import logging
 import os
+import shutil
+import socket
+import threading
+import time
 import uuid
-from datetime import datetime, timedelta
+from collections import OrderedDict
+from datetime import datetime, timezone
 from enum import Enum
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Optional, Union
 
 from robocorp.workitems._exceptions import ApplicationException, EmptyQueue
 from robocorp.workitems._adapters._base import BaseAdapter
@@ -43,14 +50,71 @@ from ._support import with_retry
 
 LOGGER = logging.getLogger(__name__)
 
+# Faster JSON codec for payloads, when installed. Both variants accept bytes;
+# orjson produces bytes, which Redis stores as is. Anything orjson doesn't
+# encode like json (datetimes, dataclasses, subclasses of builtins, non-str
+# keys, integers wider than 64 bits) falls back to the json module, so the
+# payloads accepted don't depend on orjson being installed. NaN and Infinity
+# are stored as null by orjson (json writes them as non-standard literals,
+# which are still read back)
+
+
+def _json_default(obj: object) -> JSONType:
+    """Encode the types orjson serializes natively (UUID, Enum) for json."""
+    if isinstance(obj, uuid.UUID):
+        return str(obj)
+    if isinstance(obj, Enum):
+        return obj.value
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+try:  # pragma: no cover - optional dependency
+    import orjson
+
+    _ORJSON_OPTIONS = (
+        orjson.OPT_PASSTHROUGH_DATETIME
+        | orjson.OPT_PASSTHROUGH_DATACLASS
+        | orjson.OPT_PASSTHROUGH_SUBCLASS
+    )
+
+    def _orjson_default(obj: object) -> JSONType:
+        raise TypeError(f"Object of type {type(obj).__name__} is left to json")
+
+    def _json_dumps(obj: JSONType) -> bytes:
+        try:
+            return orjson.dumps(obj, default=_orjson_default, option=_ORJSON_OPTIONS)
+        except TypeError:
+            return json.dumps(obj, default=_json_default).encode("utf-8")
+
+    def _json_loads(data: Union[bytes, str]) -> JSONType:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            return json.loads(data)
+
+except ImportError:  # pragma: no cover
+    _json_dumps = functools.partial(json.dumps, default=_json_default)  # type: ignore[assignment]
+    _json_loads = json.loads
+
+# SIMD base64 codec for legacy (base64) inline file content, when installed
+try:  # pragma: no cover - optional dependency
+    from pybase64 import b64decode as _b64decode
+except ImportError:  # pragma: no cover
+    _b64decode = binascii.a2b_base64
+
+
 # Try to import redis
 try:  # pragma: no cover - optional dependency
     import redis as _redis_lib  # type: ignore[import-not-found]
     from redis.exceptions import (
         ConnectionError as _RedisConnectionError,  # type: ignore[import-not-found]
     )
+    from redis.utils import (
+        HIREDIS_AVAILABLE as _HIREDIS_AVAILABLE,  # type: ignore[import-not-found]
+    )
 except ImportError:  # pragma: no cover
     _redis_lib = None  # type: ignore[assignment]
+    _HIREDIS_AVAILABLE = False
 
     class _RedisConnectionError(Exception):  # type: ignore[no-redef]
         """Fallback connection error when redis is unavailable."""
@@ -65,6 +129,151 @@ INLINE_FILE_THRESHOLD = 1_000_000
 # Maximum file size (100MB)
 MAX_FILE_SIZE = 104_857_600
 
+# Marks inline file content stored as raw bytes. A NUL byte can start neither
+# a filesystem reference ("file://...") nor legacy base64 content
+INLINE_FILE_PREFIX = b"\x00"
+
+# Prefix of references to files stored on the filesystem
+FILE_REF_PREFIX = b"file://"
+
+# Marks a work item ID stored as packed UUID bytes. 0xFF never occurs in
+# UTF-8, so packed IDs can't be confused with IDs stored as text
+UUID_ID_TAG = b"\xff"
+
+# Maximum number of item_id -> queue resolutions kept per adapter (LRU)
+QUEUE_CACHE_SIZE = 1024
+
+# Work items read and recovered per round trip by orphan recovery
+RECOVERY_BATCH_SIZE = 1000
+
+# Key suffixes under a queue namespace, see RedisAdapter._key
+KEY_SUFFIXES = (
+    "pending",
+    "processing",
+    "reserved",
+    "done",
+    "failed",
+    "payload",
+    "files",
+    "state",
+    "parent",
+    "exception",
+    "timestamps",
+)
+
+# Atomically move the next pending item to processing and index it as
+# reserved. The item's own keys are only known once it is popped, so they
+# are updated by the caller (a script may only touch keys passed in KEYS).
+# KEYS: pending list, processing list, reserved index
+# ARGV: reserved_at
+RESERVE_SCRIPT = """
+local item_id = redis.call('RPOPLPUSH', KEYS[1], KEYS[2])
+if not item_id then
+    return false
+end
+redis.call('ZADD', KEYS[3], ARGV[1], item_id)
+return item_id
+"""
+
+# Return a stale reserved item to the pending list, unless it was released or
+# re-reserved since it was found stale (it left the index or got a new score).
+# KEYS: processing list, pending list, reserved index, timestamps hash,
+#       payload hash
+# ARGV: item ID, cutoff (epoch seconds), PENDING state
+# Returns 1 when the item was recovered, 0 otherwise
+RECOVER_SCRIPT = """
+local reserved_at = redis.call('ZSCORE', KEYS[3], ARGV[1])
+if not reserved_at or tonumber(reserved_at) >= tonumber(ARGV[2]) then
+    return 0
+end
+redis.call('ZREM', KEYS[3], ARGV[1])
+if redis.call('LREM', KEYS[1], 0, ARGV[1]) == 0 then
+    return 0
+end
+redis.call('LPUSH', KEYS[2], ARGV[1])
+redis.call('HDEL', KEYS[4], 'reserved_at')
+redis.call('HSET', KEYS[5], 'state', ARGV[3])
+return 1
+"""
+
+# Overwrite the payload of an existing work item, in one round trip.
+# KEYS: payload hash
+# ARGV: payload JSON
+# Returns 0 when the work item doesn't exist, 1 otherwise
+SAVE_PAYLOAD_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 0 then
+    return 0
+end
+redis.call('HSET', KEYS[1], 'payload', ARGV[1])
+return 1
+"""
+
+
+def _id_bytes(item_id: Union[str, bytes]) -> bytes:
+    """Encode a work item ID for Redis: a tag byte and 16 raw bytes for a UUID.
+
+    Only the canonical lower-case UUID form is packed, so decoding gives back
+    the exact string; any other ID is kept as UTF-8 text. IDs read back from
+    Redis are already encoded and are returned as is.
+    """
+    if isinstance(item_id, bytes):
+        return item_id
+    if len(item_id) == 36:
+        try:
+            packed = uuid.UUID(item_id)
+        except ValueError:
+            pass
+        else:
+            if str(packed) == item_id:
+                return UUID_ID_TAG + packed.bytes
+    return item_id.encode("utf-8")
+
+
+def _id_str(member: bytes) -> str:
+    """Decode a work item ID read from Redis, see ``_id_bytes``."""
+    if len(member) == 17 and member[:1] == UUID_ID_TAG:
+        return str(uuid.UUID(bytes=member[1:]))
+    return member.decode("utf-8")
+
+
+def _id_text(item_id: Union[str, bytes]) -> bytes:
+    """Return a work item ID in its text form, as used in key names."""
+    if isinstance(item_id, bytes):
+        if len(item_id) == 17 and item_id[:1] == UUID_ID_TAG:
+            return str(uuid.UUID(bytes=item_id[1:])).encode("ascii")
+        return item_id
+    return item_id.encode("utf-8")
+
+
+def _timestamp(value: bytes) -> float:
+    """Parse a stored timestamp into epoch seconds.
+
+    Timestamps are stored as epoch seconds; items written by older versions
+    carry naive UTC ISO 8601 strings instead.
+    """
+    try:
+        return float(value)
+    except ValueError:
+        legacy = datetime.fromisoformat(value.decode("utf-8"))
+        return legacy.replace(tzinfo=timezone.utc).timestamp()
+
+
+def _keepalive_options() -> dict[int, int]:
+    """TCP keepalive tuning so dead connections are noticed in about a minute.
+
+    The kernel default waits ~2h before the first probe, longer than NAT and
+    firewall idle timeouts. Options the platform lacks are skipped.
+    """
+    options = {}
+    for option, env_name, default in (
+        ("TCP_KEEPIDLE", "RC_REDIS_TCP_KEEPIDLE", "60"),
+        ("TCP_KEEPINTVL", "RC_REDIS_TCP_KEEPINTVL", "10"),
+        ("TCP_KEEPCNT", "RC_REDIS_TCP_KEEPCNT", "9"),
+    ):
+        if hasattr(socket, option):
+            options[getattr(socket, option)] = int(os.getenv(env_name, default))
+    return options
+
 
 class ProcessingState(str, Enum):
     """Lifecycle states tracked in Redis payload metadata."""
@@ -88,22 +297,40 @@ class RedisAdapter(BaseAdapter):
     Redis Key Structure:
         {queue}:pending          - List[work_item_id] (FIFO queue)
         {queue}:processing       - List[work_item_id] (reserved items)
+        {queue}:reserved         - SortedSet[work_item_id] (reserved items by reserved_at)
         {queue}:done             - Set[work_item_id] (completed items)
         {queue}:failed           - Set[work_item_id] (failed items)
         {queue}:payload:{id}     - Hash{payload, queue_name, state}
-        {queue}:files:{id}       - Hash{filename: content_or_path}
+        {queue}:files:{id}       - Hash{filename: b"\\x00" + content | "file://" + path}
         {queue}:state:{id}       - String (terminal state)
         {queue}:parent:{id}      - String (parent work item ID)
         {queue}:exception:{id}   - Hash{type, code, message}
-        {queue}:timestamps:{id}  - Hash{created_at, reserved_at, released_at}
+        {queue}:timestamps:{id}  - Hash{created_at, reserved_at, released_at} (epoch s)
         origin:{id}              - String (origin queue for cross-queue lookups)
 
+    The adapter targets a single Redis server: queue operations such as
+    RPOPLPUSH and the release transaction combine several keys, which Redis
+    Cluster rejects as CROSSSLOT.
+
+    As list/set/sorted set member, a work item UUID is stored as a 0xFF tag
+    byte followed by its 16 raw bytes; IDs that aren't canonical lower-case
+    UUIDs, and members written by earlier versions, are text. Key names
+    always use the text form, so keys written by earlier versions are read
+    as is. The adapter API uses the usual string form.
+
     Environment Variables:
         RC_REDIS_URL: Redis connection URL (default: redis://localhost:6379/0)
         RC_WORKITEM_QUEUE_NAME: Queue identifier (default: default)
         RC_WORKITEM_OUTPUT_QUEUE_NAME: Output queue name (optional, default: {queue_name}_output)
         RC_WORKITEM_FILES_DIR: Files directory (default: devdata/work_item_files)
         RC_WORKITEM_ORPHAN_TIMEOUT_MINUTES: Orphan timeout (default: 30)
+        RC_WORKITEM_BLOCK_TIMEOUT: Seconds reserve_input blocks waiting for an
+            item with BRPOPLPUSH (default: 0, don't wait)
+        RC_WORKITEM_RECOVERY_INTERVAL: Seconds between orphan recovery runs on
+            a background thread (default: 0, no background recovery)
+        RC_REDIS_TCP_KEEPIDLE: Idle seconds before TCP keepalive probes (default: 60)
+        RC_REDIS_TCP_KEEPINTVL: Seconds between keepalive probes (default: 10)
+        RC_REDIS_TCP_KEEPCNT: Failed probes before the connection drops (default: 9)
 
     lazydocs: ignore
     """
@@ -133,10 +360,20 @@ class RedisAdapter(BaseAdapter):
         self.orphan_timeout_minutes = int(
             os.getenv("RC_WORKITEM_ORPHAN_TIMEOUT_MINUTES", "30")
         )
+        # Seconds reserve_input waits for an item on an empty queue (0: no wait)
+        self.block_timeout = int(os.getenv("RC_WORKITEM_BLOCK_TIMEOUT", "0"))
+        # Seconds between background orphan recoveries (0: none)
+        self.recovery_interval = float(os.getenv("RC_WORKITEM_RECOVERY_INTERVAL", "0"))
 
         # Create files directory
         self.files_dir.mkdir(parents=True, exist_ok=True)
 
+        # (queue, suffix) -> (queue-level key, item key prefix), see _key
+        self._key_prefixes: dict[tuple[str, str], tuple[bytes, bytes]] = {}
+        for queue in (self.queue_name, self.output_queue_name):
+            for suffix in KEY_SUFFIXES:
+                self._key_parts(queue, suffix)
+
         # Initialize Redis client
         try:
             self._client = _redis_lib.from_url(
@@ -144,6 +381,7 @@ class RedisAdapter(BaseAdapter):
                 decode_responses=False,  # Handle binary data
                 socket_connect_timeout=5,
                 socket_keepalive=True,
+                socket_keepalive_options=_keepalive_options(),
                 health_check_interval=30,
             )
 
@@ -151,40 +389,72 @@ class RedisAdapter(BaseAdapter):
             self._client.ping()
 
             LOGGER.info(
-                "RedisAdapter initialized: url=%s, queue=%s",
+                "RedisAdapter initialized: url=%s, queue=%s, parser=%s",
                 redis_url,
                 self.queue_name,
+                "hiredis" if _HIREDIS_AVAILABLE else "python",
             )
         except Exception as e:
             LOGGER.critical("Failed to connect to Redis: %s", e)
             raise ApplicationException(f"Redis connection failed: {e}")
 
-        # Cache for resolved queues to avoid redundant lookups
-        self._queue_cache: dict[str, str] = {}
+        # LRU cache of resolved queues to avoid redundant lookups
+        self._queue_cache: OrderedDict[str, str] = OrderedDict()
+
+        # Sent by EVALSHA, reloaded transparently if the script cache is flushed
+        self._reserve_script = self._client.register_script(RESERVE_SCRIPT)
+        self._save_payload_script = self._client.register_script(SAVE_PAYLOAD_SCRIPT)
+        self._recover_script = self._client.register_script(RECOVER_SCRIPT)
+
+        # Recovery is atomic per item, so every worker may sweep concurrently
+        self._sweeper_stop = threading.Event()
+        self._sweeper: Optional[threading.Thread] = None
+        if self.recovery_interval > 0:
+            self._sweeper = threading.Thread(
+                target=self._sweep_orphans, name="redis-orphan-sweeper", daemon=True
+            )
+            self._sweeper.start()
 
-    def _key(self, suffix: str, queue: Optional[str] = None, item_id: str = "") -> str:
+    def _key(
+        self, suffix: str, queue: Optional[str] = None, item_id: Union[str, bytes] = ""
+    ) -> bytes:
         """Generate Redis key with queue namespace.
 
         Args:
             suffix: Key suffix (e.g., 'pending', 'payload', 'files')
             queue: Queue namespace (defaults to adapter queue)
-            item_id: Work item ID (optional, for item-specific keys)
+            item_id: Work item ID, or its encoded form as read from Redis
+                (optional, for item-specific keys)
 
         Returns:
-            Redis key string
+            Redis key
         """
         if suffix == "origin":
-            return f"origin:{item_id}" if item_id else "origin"
+            return b"origin:" + _id_text(item_id) if item_id else b"origin"
 
-        queue_name = queue or self.queue_name
+        key, item_prefix = self._key_parts(queue or self.queue_name, suffix)
         if item_id:
-            return f"{queue_name}:{suffix}:{item_id}"
-        return f"{queue_name}:{suffix}"
+            return item_prefix + _id_text(item_id)
+        return key
+
+    def _key_parts(self, queue_name: str, suffix: str) -> tuple[bytes, bytes]:
+        """Return the queue-level key and the item key prefix for a suffix.
+
+        Both are built once per (queue, suffix) and cached, so composing a key
+        on the hot path is a dict lookup and one concatenation.
+        """
+        try:
+            return self._key_prefixes[queue_name, suffix]
+        except KeyError:
+            key = f"{queue_name}:{suffix}".encode("utf-8")
+            parts = self._key_prefixes[queue_name, suffix] = (key, key + b":")
+            return parts
 
     def _resolve_item_queue(self, item_id: str) -> str:
         """Determine which queue namespace contains the work item.
 
-        Checks input queue, output queue, and origin tracking key.
+        Reads the origin tracking key written when the item was created.
+        Items without one are looked up in the input and output queues.
         Results are cached to avoid redundant Redis operations.
 
         Args:
@@ -197,42 +467,91 @@ class RedisAdapter(BaseAdapter):
             ValueError: If work item not found in any queue
         """
         # Check cache first
-        if item_id in self._queue_cache:
-            return self._queue_cache[item_id]
+        cached = self._cached_queue(item_id)
+        if cached is not None:
+            return cached
 
-        # Check input queue
-        if self._client.hexists(self._key("payload", item_id=item_id), "payload"):
-            queue_name = self.queue_name
+        origin = self._client.get(self._key("origin", item_id=item_id))
+        if origin is not None:
+            queue_name = origin.decode("utf-8")
         else:
-            # Check origin tracking
-            origin = self._client.get(f"origin:{item_id}")
-            if origin:
-                queue_name = (
-                    origin.decode("utf-8") if isinstance(origin, bytes) else origin
-                )
-                if self._client.hexists(
-                    self._key("payload", queue=queue_name, item_id=item_id), "payload"
-                ):
-                    pass  # queue_name is set
-                else:
-                    queue_name = None
+            # No origin key: probe both queues in one round trip
+            pipe = self._client.pipeline(transaction=False)
+            pipe.hexists(self._key("payload", item_id=item_id), "payload")
+            pipe.hexists(
+                self._key("payload", queue=self.output_queue_name, item_id=item_id),
+                "payload",
+            )
+            in_input, in_output = pipe.execute()
+            if in_input:
+                queue_name = self.queue_name
+            elif in_output:
+                queue_name = self.output_queue_name
             else:
-                queue_name = None
-
-            # Check output queue if not found
-            if queue_name is None:
-                if self._client.hexists(
-                    self._key("payload", queue=self.output_queue_name, item_id=item_id),
-                    "payload",
-                ):
-                    queue_name = self.output_queue_name
-                else:
-                    raise ValueError(f"Work item not found: {item_id}")
+                raise ValueError(f"Work item not found: {item_id}")
 
         # Cache the result
-        self._queue_cache[item_id] = queue_name
+        self._cache_queue(item_id, queue_name)
+        return queue_name
+
+    def _cached_queue(self, item_id: str) -> Optional[str]:
+        """Return the cached queue of a work item, marking it recently used."""
+        queue_name = self._queue_cache.get(item_id)
+        if queue_name is not None:
+            self._queue_cache.move_to_end(item_id)
         return queue_name
 
+    def _cache_queue(self, item_id: str, queue_name: str) -> None:
+        """Cache the queue of a work item, evicting the least recently used entry."""
+        self._queue_cache[item_id] = queue_name
+        self._queue_cache.move_to_end(item_id)
+        if len(self._queue_cache) > QUEUE_CACHE_SIZE:
+            self._queue_cache.popitem(last=False)
+
+    def _resolve_and_load(self, item_id: str) -> Optional[bytes]:
+        """Fetch the raw JSON payload of a work item, resolving its queue on the way.
+
+        Unlike ``_resolve_item_queue`` followed by HGET, the input and output
+        queues and the origin key are probed in a single pipelined round trip.
+
+        Args:
+            item_id: Work item ID
+
+        Returns:
+            Raw payload JSON, or None if the work item was not found
+        """
+        cached = self._cached_queue(item_id)
+        if cached is not None:
+            return self._client.hget(
+                self._key("payload", queue=cached, item_id=item_id), "payload"
+            )
+
+        pipe = self._client.pipeline(transaction=False)
+        pipe.hget(self._key("payload", item_id=item_id), "payload")
+        pipe.hget(
+            self._key("payload", queue=self.output_queue_name, item_id=item_id), "payload"
+        )
+        pipe.get(self._key("origin", item_id=item_id))
+        input_payload, output_payload, origin = pipe.execute()
+
+        if input_payload is not None:
+            self._cache_queue(item_id, self.queue_name)
+            return input_payload
+
+        if origin:
+            origin_queue = origin.decode("utf-8")
+            if origin_queue not in (self.queue_name, self.output_queue_name):
+                payload_json = self._client.hget(
+                    self._key("payload", queue=origin_queue, item_id=item_id), "payload"
+                )
+                if payload_json is not None:
+                    self._cache_queue(item_id, origin_queue)
+                    return payload_json
+
+        if output_payload is not None:
+            self._cache_queue(item_id, self.output_queue_name)
+        return output_payload
+
     @with_retry(
         max_attempts=3,
         backoff_factor=0.1,
@@ -241,45 +560,42 @@ class RedisAdapter(BaseAdapter):
     def reserve_input(self) -> str:
         """Reserve next pending work item from queue.
 
-        Uses RPOPLPUSH to atomically move from pending to processing list.
+        Uses a Lua script around RPOPLPUSH to atomically move the item from the
+        pending to the processing list and add it to the reserved index, then
+        marks the item itself reserved.
 
         Returns:
             str: Work item ID (UUID)
 
         Raises:
-            EmptyQueue: No pending work items available
+            EmptyQueue: No pending work items available (within
+                RC_WORKITEM_BLOCK_TIMEOUT, when set)
             DatabaseTemporarilyUnavailable: Redis connection error (retried)
         """
         LOGGER.debug("Reserving next input work item from queue: %s", self.queue_name)
 
         try:
-            # Atomic move: pending -> processing
-            item_id = self._client.rpoplpush(
-                self._key("pending"),
-                self._key("processing"),
-            )
+            if self.block_timeout > 0:
+                item_id_str = self._reserve_blocking()
+            else:
+                # Atomic move pending -> processing, indexed by reserved_at
+                now = time.time()
+                item_id = self._reserve_script(
+                    keys=[
+                        self._key("pending"),
+                        self._key("processing"),
+                        self._key("reserved"),
+                    ],
+                    args=[now],
+                )
+                item_id_str = None
+                if item_id is not None:
+                    self._mark_reserved(item_id, now)
+                    item_id_str = _id_str(item_id)
 
-            if item_id is None:
+            if item_id_str is None:
                 raise EmptyQueue(f"No work items in queue: {self.queue_name}")
 
-            # Decode bytes to string
-            item_id_str = (
-                item_id.decode("utf-8") if isinstance(item_id, bytes) else item_id
-            )
-
-            # Update timestamps
-            now = datetime.utcnow().isoformat()
-            self._client.hset(
-                self._key("timestamps", item_id=item_id_str), "reserved_at", now
-            )
-
-            # Update state in payload metadata
-            self._client.hset(
-                self._key("payload", item_id=item_id_str),
-                "state",
-                ProcessingState.RESERVED.value,
-            )
-
             LOGGER.info("Reserved input work item: %s", item_id_str)
             return item_id_str
 
@@ -287,6 +603,39 @@ class RedisAdapter(BaseAdapter):
             LOGGER.error("Redis connection error during reserve: %s", e)
             raise DatabaseTemporarilyUnavailable(f"Redis connection failed: {e}")
 
+    def _reserve_blocking(self) -> Optional[str]:
+        """Reserve with BRPOPLPUSH, waiting up to ``block_timeout`` for an item.
+
+        Blocking commands don't block inside Lua scripts, so the item is
+        indexed as reserved in the follow-up round trip instead.
+
+        Returns:
+            Work item ID, or None if the queue stayed empty
+        """
+        item_id = self._client.brpoplpush(
+            self._key("pending"), self._key("processing"), timeout=self.block_timeout
+        )
+        if item_id is None:
+            return None
+
+        self._mark_reserved(item_id, time.time(), index=True)
+        return _id_str(item_id)
+
+    def _mark_reserved(self, item_id: bytes, reserved_at: float, index: bool = False) -> None:
+        """Stamp reserved_at and the RESERVED state on a reserved item.
+
+        Args:
+            item_id: Encoded work item ID, as popped from the pending list
+            reserved_at: Reservation time (epoch seconds)
+            index: Also add the item to the reserved index
+        """
+        pipe = self._client.pipeline(transaction=False)
+        if index:
+            pipe.zadd(self._key("reserved"), {item_id: reserved_at})
+        pipe.hset(self._key("timestamps", item_id=item_id), "reserved_at", reserved_at)
+        pipe.hset(self._key("payload", item_id=item_id), "state", ProcessingState.RESERVED.value)
+        pipe.execute()
+
     @with_retry(
         max_attempts=3,
         backoff_factor=0.1,
@@ -314,47 +663,49 @@ class RedisAdapter(BaseAdapter):
         if state == State.FAILED and not exception:
             raise ValueError("Exception details required when state=FAILED")
 
-        try:
-            # Remove from processing list
-            self._client.lrem(self._key("processing"), 0, item_id)
-
-            # Add to appropriate terminal set
-            lifecycle_state = (
-                ProcessingState.COMPLETED.value
-                if state == State.DONE
-                else ProcessingState.FAILED.value
-            )
+        lifecycle_state = (
+            ProcessingState.COMPLETED.value
+            if state == State.DONE
+            else ProcessingState.FAILED.value
+        )
 
-            if state == State.DONE:
-                self._client.sadd(self._key("done"), item_id)
-            else:
-                self._client.sadd(self._key("failed"), item_id)
-
-                # Store exception details
-                if exception:
-                    self._client.hset(
-                        self._key("exception", item_id=item_id),
-                        mapping={
-                            "type": exception.get("type", "UnknownException"),
-                            "code": exception.get("code", ""),
-                            "message": exception.get("message", ""),
-                        },
-                    )
-                    self._client.expire(self._key("exception", item_id=item_id), 86400)
+        try:
+            # The whole transition is applied atomically, in one round trip.
+            # It spans queue and item keys, so this needs a non-cluster server
+            with self._client.pipeline(transaction=True) as pipe:
+                # Move from the processing list to the terminal set
+                member = _id_bytes(item_id)
+                pipe.lrem(self._key("processing"), 0, member)
+                pipe.zrem(self._key("reserved"), member)
+                legacy_member = _id_text(item_id)
+                if legacy_member != member:
+                    # Reserved by an earlier version, which stored text IDs
+                    pipe.lrem(self._key("processing"), 0, legacy_member)
+                    pipe.zrem(self._key("reserved"), legacy_member)
+                if state == State.DONE:
+                    pipe.sadd(self._key("done"), member)
+                else:
+                    pipe.sadd(self._key("failed"), member)
+
+                    # Store exception details
+                    if exception:
+                        pipe.hset(
+                            self._key("exception", item_id=item_id),
+                            mapping={
+                                "type": exception.get("type", "UnknownException"),
+                                "code": exception.get("code", ""),
+                                "message": exception.get("message", ""),
+                            },
+                        )
+                        pipe.expire(self._key("exception", item_id=item_id), 86400)
 
-            # Update timestamps
-            now = datetime.utcnow().isoformat()
-            self._client.hset(
-                self._key("timestamps", item_id=item_id), "released_at", now
-            )
+                now = time.time()
+                pipe.hset(self._key("timestamps", item_id=item_id), "released_at", now)
 
-            # Store terminal state
-            self._client.set(self._key("state", item_id=item_id), state.value)
-            self._client.hset(
-                self._key("payload", item_id=item_id),
-                "state",
-                lifecycle_state,
-            )
+                # Store terminal state
+                pipe.set(self._key("state", item_id=item_id), state.value)
+                pipe.hset(self._key("payload", item_id=item_id), "state", lifecycle_state)
+                pipe.execute()
 
             log_func = LOGGER.error if state == State.FAILED else LOGGER.info
             log_func(
@@ -401,87 +752,169 @@ class RedisAdapter(BaseAdapter):
         )
 
         try:
-            # Store payload metadata
-            self._client.hset(
-                self._key("payload", queue=output_queue, item_id=item_id),
-                mapping={
-                    "payload": json.dumps(payload_data),
-                    "queue_name": output_queue,
-                    "state": ProcessingState.PENDING.value,
-                },
-            )
-            self._client.expire(
-                self._key("payload", queue=output_queue, item_id=item_id),
-                TTL_WEEK_SECONDS,
-            )
+            # All writes are queued and sent in a single round trip
+            pipe = self._client.pipeline(transaction=False)
+            self._queue_output(pipe, item_id, parent_id, payload_data, time.time())
+            pipe.execute()
 
-            # Store parent relationship
-            if parent_id:
-                self._client.set(
-                    self._key("parent", queue=output_queue, item_id=item_id), parent_id
-                )
-                self._client.expire(
-                    self._key("parent", queue=output_queue, item_id=item_id),
-                    TTL_WEEK_SECONDS,
-                )
+            LOGGER.info("Created output work item: %s", item_id)
+            return item_id
 
-            # Store timestamps
-            now = datetime.utcnow().isoformat()
-            self._client.hset(
-                self._key("timestamps", queue=output_queue, item_id=item_id),
-                mapping={"created_at": now},
-            )
-            self._client.expire(
-                self._key("timestamps", queue=output_queue, item_id=item_id),
-                TTL_WEEK_SECONDS,
-            )
+        except RedisConnectionError as e:
+            LOGGER.error("Redis connection error during create: %s", e)
+            raise DatabaseTemporarilyUnavailable(f"Redis connection failed: {e}")
 
-            # Add to output pending queue (LPUSH for FIFO with RPOPLPUSH)
-            self._client.lpush(self._key("pending", queue=output_queue), item_id)
+    @with_retry(
+        max_attempts=3,
+        backoff_factor=0.1,
+        exceptions=(RedisConnectionError, DatabaseTemporarilyUnavailable),
+    )
+    def create_outputs_bulk(
+        self, parent_id: Optional[str], payloads: list[Optional[JSONType]]
+    ) -> list[str]:
+        """Create several output work items in a single round trip.
 
-            # Store origin queue for cross-queue lookups
-            self._client.set(f"origin:{item_id}", output_queue, ex=TTL_WEEK_SECONDS)
+        Equivalent to calling ``create_output`` for each payload, but all
+        writes go out in one pipeline.
 
-            LOGGER.info("Created output work item: %s", item_id)
-            return item_id
+        Args:
+            parent_id: Parent work item ID shared by all outputs
+            payloads: JSON payload data, one per output work item
+
+        Returns:
+            list[str]: New work item IDs, in the order of ``payloads``
+
+        Raises:
+            DatabaseTemporarilyUnavailable: Redis connection error (retried)
+        """
+        item_ids = [str(uuid.uuid4()) for _ in payloads]
+
+        LOGGER.debug(
+            "Creating %d output work items for parent %s in queue %s",
+            len(item_ids),
+            parent_id or "None",
+            self.output_queue_name,
+        )
+
+        try:
+            pipe = self._client.pipeline(transaction=False)
+            now = time.time()
+            for item_id, payload in zip(item_ids, payloads, strict=True):
+                payload_data = payload if payload is not None else {}
+                self._queue_output(pipe, item_id, parent_id, payload_data, now)
+            if item_ids:
+                pipe.execute()
+
+            LOGGER.info("Created %d output work items", len(item_ids))
+            return item_ids
 
         except RedisConnectionError as e:
-            LOGGER.error("Redis connection error during create: %s", e)
+            LOGGER.error("Redis connection error during bulk create: %s", e)
             raise DatabaseTemporarilyUnavailable(f"Redis connection failed: {e}")
 
-    def seed_input(self, payload: Optional[JSONType] = None) -> str:
+    def _queue_output(
+        self, pipe, item_id: str, parent_id: Optional[str], payload: JSONType, now: float
+    ) -> None:
+        """Queue the writes creating one output work item on a pipeline."""
+        output_queue = self.output_queue_name
+
+        # Store payload metadata
+        pipe.hset(
+            self._key("payload", queue=output_queue, item_id=item_id),
+            mapping={
+                "payload": _json_dumps(payload),
+                "queue_name": output_queue,
+                "state": ProcessingState.PENDING.value,
+            },
+        )
+        pipe.expire(
+            self._key("payload", queue=output_queue, item_id=item_id),
+            TTL_WEEK_SECONDS,
+        )
+
+        # Store parent relationship
+        if parent_id:
+            pipe.set(
+                self._key("parent", queue=output_queue, item_id=item_id),
+                parent_id,
+                ex=TTL_WEEK_SECONDS,
+            )
+
+        # Store timestamps
+        pipe.hset(
+            self._key("timestamps", queue=output_queue, item_id=item_id),
+            mapping={"created_at": now},
+        )
+        pipe.expire(
+            self._key("timestamps", queue=output_queue, item_id=item_id),
+            TTL_WEEK_SECONDS,
+        )
+
+        # Add to output pending queue (LPUSH for FIFO with RPOPLPUSH)
+        pipe.lpush(self._key("pending", queue=output_queue), _id_bytes(item_id))
+
+        # Store origin queue for cross-queue lookups
+        pipe.set(self._key("origin", item_id=item_id), output_queue, ex=TTL_WEEK_SECONDS)
+
+    def seed_input(
+        self,
+        payload: Optional[JSONType] = None,
+        files: Optional[list[tuple[str, bytes]]] = None,
+    ) -> str:
         """Create work item directly in input queue (for testing).
 
+        Files are written in the same pipeline as the item itself; the item is
+        new, so there are no existing files to check for.
+
         Args:
             payload: JSON payload data
+            files: List of (filename, content) tuples (optional)
 
         Returns:
             str: New work item ID
+
+        Raises:
+            ValueError: Invalid or duplicate filename, or file too large
         """
         item_id = str(uuid.uuid4())
         payload_data = payload if payload is not None else {}
 
+        files = files or []
+        for name, content in files:
+            self._validate_file(name, len(content))
+        if len({name for name, _ in files}) != len(files):
+            raise ValueError("Duplicate filenames in files")
+
         try:
-            self._client.hset(
+            pipe = self._client.pipeline(transaction=False)
+            pipe.hset(
                 self._key("payload", item_id=item_id),
                 mapping={
-                    "payload": json.dumps(payload_data),
+                    "payload": _json_dumps(payload_data),
                     "queue_name": self.queue_name,
                     "state": ProcessingState.PENDING.value,
                 },
             )
-            self._client.expire(self._key("payload", item_id=item_id), TTL_WEEK_SECONDS)
-
-            now = datetime.utcnow().isoformat()
-            self._client.hset(
-                self._key("timestamps", item_id=item_id), mapping={"created_at": now}
-            )
-            self._client.expire(
-                self._key("timestamps", item_id=item_id), TTL_WEEK_SECONDS
-            )
+            pipe.expire(self._key("payload", item_id=item_id), TTL_WEEK_SECONDS)
+
+            now = time.time()
+            pipe.hset(self._key("timestamps", item_id=item_id), mapping={"created_at": now})
+            pipe.expire(self._key("timestamps", item_id=item_id), TTL_WEEK_SECONDS)
+
+            if files:
+                files_key = self._key("files", item_id=item_id)
+                pipe.hset(
+                    files_key,
+                    mapping={
+                        name: self._store_file(item_id, name, content)
+                        for name, content in files
+                    },
+                )
+                pipe.expire(files_key, TTL_WEEK_SECONDS)
 
-            self._client.lpush(self._key("pending"), item_id)
-            self._client.set(f"origin:{item_id}", self.queue_name, ex=TTL_WEEK_SECONDS)
+            pipe.lpush(self._key("pending"), _id_bytes(item_id))
+            pipe.set(self._key("origin", item_id=item_id), self.queue_name, ex=TTL_WEEK_SECONDS)
+            pipe.execute()
 
             LOGGER.debug("Seeded input work item: %s", item_id)
             return item_id
@@ -511,21 +944,12 @@ class RedisAdapter(BaseAdapter):
         LOGGER.debug("Loading payload for work item: %s", item_id)
 
         try:
-            queue_name = self._resolve_item_queue(item_id)
-            payload_json = self._client.hget(
-                self._key("payload", queue=queue_name, item_id=item_id), "payload"
-            )
+            payload_json = self._resolve_and_load(item_id)
 
             if payload_json is None:
                 raise ValueError(f"Work item not found: {item_id}")
 
-            # Decode and parse JSON
-            payload_str = (
-                payload_json.decode("utf-8")
-                if isinstance(payload_json, bytes)
-                else payload_json
-            )
-            return json.loads(payload_str)
+            return _json_loads(payload_json)
 
         except RedisConnectionError as e:
             LOGGER.error("Redis connection error during load_payload: %s", e)
@@ -554,18 +978,15 @@ class RedisAdapter(BaseAdapter):
 
         try:
             queue_name = self._resolve_item_queue(item_id)
-            exists = self._client.exists(
-                self._key("payload", queue=queue_name, item_id=item_id)
-            )
-            if not exists:
-                raise ValueError(f"Work item not found: {item_id}")
+            payload_json = _json_dumps(payload)
 
-            payload_json = json.dumps(payload)
-            self._client.hset(
-                self._key("payload", queue=queue_name, item_id=item_id),
-                "payload",
-                payload_json,
+            # Existence check and write in one script: no race with expiry
+            saved = self._save_payload_script(
+                keys=[self._key("payload", queue=queue_name, item_id=item_id)],
+                args=[payload_json],
             )
+            if not saved:
+                raise ValueError(f"Work item not found: {item_id}")
 
         except RedisConnectionError as e:
             LOGGER.error("Redis connection error during save_payload: %s", e)
@@ -599,10 +1020,8 @@ class RedisAdapter(BaseAdapter):
                 self._key("files", queue=queue_name, item_id=item_id)
             )
 
-            filenames = [
-                f.decode("utf-8") if isinstance(f, bytes) else f for f in files_hash
-            ]
-            return filenames
+            # The client never decodes responses: names are always bytes
+            return list(map(bytes.decode, files_hash))
 
         except RedisConnectionError as e:
             LOGGER.error("Redis connection error during list_files: %s", e)
@@ -642,25 +1061,65 @@ class RedisAdapter(BaseAdapter):
                     f"File not found: {name} (work item: {item_id})"
                 )
 
-            # Decode reference
-            file_ref_str = (
-                file_ref.decode("utf-8") if isinstance(file_ref, bytes) else file_ref
-            )
+            if file_ref.startswith(INLINE_FILE_PREFIX):
+                # Inline storage (raw bytes)
+                return file_ref[len(INLINE_FILE_PREFIX) :]
 
             # Check if filesystem reference
-            if file_ref_str.startswith("file://"):
-                filepath = Path(file_ref_str[7:])
+            if file_ref.startswith(FILE_REF_PREFIX):
+                filepath = Path(file_ref[len(FILE_REF_PREFIX) :].decode("utf-8"))
                 if not filepath.exists():
                     raise FileNotFoundError(f"File not found on filesystem: {filepath}")
                 return filepath.read_bytes()
-            else:
-                # Inline storage (base64 encoded)
-                return base64.b64decode(file_ref)
+
+            # Inline storage written before raw bytes (base64 encoded)
+            return _b64decode(file_ref)
 
         except RedisConnectionError as e:
             LOGGER.error("Redis connection error during get_file: %s", e)
             raise DatabaseTemporarilyUnavailable(f"Redis connection failed: {e}")
 
+    @staticmethod
+    def _validate_file(name: str, size: int) -> None:
+        """Check a file's name and size before it is stored.
+
+        Raises:
+            ValueError: Invalid filename or file too large
+        """
+        if "/" in name or "\\" in name:
+            raise ValueError(f"Invalid filename (no path separators): {name}")
+
+        if len(name) > 255:
+            raise ValueError(f"Filename too long (max 255 chars): {name}")
+
+        if size > MAX_FILE_SIZE:
+            raise ValueError(f"File too large (max {MAX_FILE_SIZE} bytes): {size} bytes")
+
+    def _store_file(self, item_id: str, name: str, content: bytes) -> bytes:
+        """Return the files-hash value for a file, writing large files to disk.
+
+        Uses hybrid storage: inline (raw bytes) <1MB, filesystem >1MB.
+        """
+        if len(content) > INLINE_FILE_THRESHOLD:
+            filepath = self.files_dir / item_id / name
+            filepath.parent.mkdir(parents=True, exist_ok=True)
+            filepath.write_bytes(content)
+            return FILE_REF_PREFIX + str(filepath).encode("utf-8")
+
+        # Redis values are binary-safe: no encoding needed
+        return INLINE_FILE_PREFIX + content
+
+    def _store_file_from_path(self, item_id: str, name: str, source: Path) -> bytes:
+        """Like ``_store_file``, but copies large files without loading them."""
+        if source.stat().st_size <= INLINE_FILE_THRESHOLD:
+            return self._store_file(item_id, name, source.read_bytes())
+
+        filepath = self.files_dir / item_id / name
+        filepath.parent.mkdir(parents=True, exist_ok=True)
+        # Copied in kernel space where supported, otherwise in chunks
+        shutil.copyfile(source, filepath)
+        return FILE_REF_PREFIX + str(filepath).encode("utf-8")
+
     @with_retry(
         max_attempts=3,
         backoff_factor=0.1,
@@ -681,62 +1140,81 @@ class RedisAdapter(BaseAdapter):
             FileExistsError: File already exists
             DatabaseTemporarilyUnavailable: Redis connection error (retried)
         """
-        # Validate filename
-        if "/" in name or "\\" in name:
-            raise ValueError(f"Invalid filename (no path separators): {name}")
-
-        if len(name) > 255:
-            raise ValueError(f"Filename too long (max 255 chars): {name}")
-
-        if len(content) > MAX_FILE_SIZE:
-            raise ValueError(
-                f"File too large (max {MAX_FILE_SIZE} bytes): {len(content)} bytes"
-            )
+        self._validate_file(name, len(content))
 
         LOGGER.debug(
             "Adding file '%s' to work item %s (%d bytes)", name, item_id, len(content)
         )
 
         try:
-            # Resolve queue first to avoid redundant lookups
-            queue_name = self._resolve_item_queue(item_id)
+            self._attach_file(item_id, name, lambda: self._store_file(item_id, name, content))
 
-            # Check if file already exists
-            exists = self._client.hexists(
-                self._key("files", queue=queue_name, item_id=item_id), name
-            )
-            if exists:
-                raise FileExistsError(f"File already exists: {name}")
-
-            if len(content) > INLINE_FILE_THRESHOLD:
-                # Large file: Store on filesystem
-                filepath = self.files_dir / item_id / name
-                filepath.parent.mkdir(parents=True, exist_ok=True)
-                filepath.write_bytes(content)
-
-                self._client.hset(
-                    self._key("files", queue=queue_name, item_id=item_id),
-                    name,
-                    f"file://{filepath}",
-                )
-            else:
-                # Small file: Store inline (base64)
-                encoded_content = base64.b64encode(content).decode("utf-8")
-                self._client.hset(
-                    self._key("files", queue=queue_name, item_id=item_id),
-                    name,
-                    encoded_content,
-                )
+        except RedisConnectionError as e:
+            LOGGER.error("Redis connection error during add_file: %s", e)
+            raise DatabaseTemporarilyUnavailable(f"Redis connection failed: {e}")
+
+    @with_retry(
+        max_attempts=3,
+        backoff_factor=0.1,
+        exceptions=(RedisConnectionError, DatabaseTemporarilyUnavailable),
+    )
+    def add_file_from_path(self, item_id: str, name: str, path: Union[str, Path]) -> None:
+        """Attach a file from disk to work item.
+
+        Files above the inline threshold are copied into the files directory
+        without their content being held in memory as a whole.
 
-            # Set expiration
-            self._client.expire(
-                self._key("files", queue=queue_name, item_id=item_id), TTL_WEEK_SECONDS
+        Args:
+            item_id: Work item ID
+            name: Filename
+            path: Path of the file to attach
+
+        Raises:
+            ValueError: Invalid filename or file too large
+            FileExistsError: File already exists
+            DatabaseTemporarilyUnavailable: Redis connection error (retried)
+        """
+        source = Path(path)
+        self._validate_file(name, source.stat().st_size)
+
+        LOGGER.debug("Adding file '%s' to work item %s from %s", name, item_id, path)
+
+        try:
+            self._attach_file(
+                item_id, name, lambda: self._store_file_from_path(item_id, name, source)
             )
 
         except RedisConnectionError as e:
-            LOGGER.error("Redis connection error during add_file: %s", e)
+            LOGGER.error("Redis connection error during add_file_from_path: %s", e)
             raise DatabaseTemporarilyUnavailable(f"Redis connection failed: {e}")
 
+    def _attach_file(self, item_id: str, name: str, store: Callable[[], bytes]) -> None:
+        """Store a file and record it in the item's files hash.
+
+        Args:
+            item_id: Work item ID
+            name: Filename
+            store: Stores the content and returns the files-hash value
+
+        Raises:
+            FileExistsError: File already exists
+        """
+        # Resolve queue first to avoid redundant lookups
+        queue_name = self._resolve_item_queue(item_id)
+        files_key = self._key("files", queue=queue_name, item_id=item_id)
+
+        # Check if file already exists
+        if self._client.hexists(files_key, name):
+            raise FileExistsError(f"File already exists: {name}")
+
+        value = store()
+
+        # Record the file and refresh the TTL in one round trip
+        with self._client.pipeline(transaction=False) as pipe:
+            pipe.hset(files_key, name, value)
+            pipe.expire(files_key, TTL_WEEK_SECONDS)
+            pipe.execute()
+
     @with_retry(
         max_attempts=3,
         backoff_factor=0.1,
@@ -768,14 +1246,9 @@ class RedisAdapter(BaseAdapter):
                     f"File not found: {name} (work item: {item_id})"
                 )
 
-            # Decode reference
-            file_ref_str = (
-                file_ref.decode("utf-8") if isinstance(file_ref, bytes) else file_ref
-            )
-
             # Delete from filesystem if large file
-            if file_ref_str.startswith("file://"):
-                filepath = Path(file_ref_str[7:])
+            if file_ref.startswith(FILE_REF_PREFIX):
+                filepath = Path(file_ref[len(FILE_REF_PREFIX) :].decode("utf-8"))
                 if filepath.exists():
                     filepath.unlink()
 
@@ -796,7 +1269,7 @@ class RedisAdapter(BaseAdapter):
         Returns:
             list[str]: List of recovered work item IDs
         """
-        cutoff_time = datetime.utcnow() - timedelta(minutes=self.orphan_timeout_minutes)
+        cutoff_time = time.time() - self.orphan_timeout_minutes * 60
 
         LOGGER.info(
             "Recovering orphaned work items (timeout: %d min)",
@@ -804,51 +1277,65 @@ class RedisAdapter(BaseAdapter):
         )
 
         try:
-            processing_items = self._client.lrange(self._key("processing"), 0, -1)
-            recovered_ids = []
+            # Items reserved before the index existed are indexed first
+            pipe = self._client.pipeline(transaction=False)
+            pipe.llen(self._key("processing"))
+            pipe.zcard(self._key("reserved"))
+            processing_count, indexed_count = pipe.execute()
+            if processing_count > indexed_count:
+                self._index_reservations(processing_count)
+
+            # Only the stale head of the index is read, one batch at a time.
+            # Every stale item leaves the index when handled (or got a newer
+            # score by being re-reserved), so each batch starts at 0
+            processing_key = self._key("processing")
+            pending_key = self._key("pending")
+            reserved_key = self._key("reserved")
+            timestamps_prefix = self._key_parts(self.queue_name, "timestamps")[1]
+            payload_prefix = self._key_parts(self.queue_name, "payload")[1]
 
-            for item_id_bytes in processing_items:
-                item_id = (
-                    item_id_bytes.decode("utf-8")
-                    if isinstance(item_id_bytes, bytes)
-                    else item_id_bytes
-                )
-
-                # Get reserved_at timestamp
-                reserved_at_str = self._client.hget(
-                    self._key("timestamps", item_id=item_id), "reserved_at"
+            recovered_ids = []
+            while True:
+                stale = self._client.zrangebyscore(
+                    reserved_key,
+                    "-inf",
+                    f"({cutoff_time!r}",
+                    start=0,
+                    num=RECOVERY_BATCH_SIZE,
                 )
-
-                if reserved_at_str:
-                    reserved_at_decoded = (
-                        reserved_at_str.decode("utf-8")
-                        if isinstance(reserved_at_str, bytes)
-                        else reserved_at_str
+                if not stale:
+                    break
+
+                # Move each orphan back to pending atomically, the batch in one
+                # round trip; items released or re-reserved meanwhile are left alone
+                pipe = self._client.pipeline(transaction=False)
+                for member in stale:
+                    self._recover_script(
+                        keys=[
+                            processing_key,
+                            pending_key,
+                            reserved_key,
+                            timestamps_prefix + _id_text(member),
+                            payload_prefix + _id_text(member),
+                        ],
+                        args=[member, cutoff_time, ProcessingState.PENDING.value],
+                        client=pipe,
                     )
-                    reserved_at = datetime.fromisoformat(reserved_at_decoded)
-
-                    if reserved_at < cutoff_time:
-                        # Move back to pending
-                        self._client.lrem(self._key("processing"), 0, item_id)
-                        self._client.lpush(self._key("pending"), item_id)
-
-                        # Clear reserved_at timestamp
-                        self._client.hdel(
-                            self._key("timestamps", item_id=item_id), "reserved_at"
-                        )
-
-                        # Update state
-                        self._client.hset(
-                            self._key("payload", item_id=item_id),
-                            "state",
-                            ProcessingState.PENDING.value,
-                        )
-
-                        recovered_ids.append(item_id)
-                        LOGGER.warning("Recovered orphaned work item: %s", item_id)
-
+                results = pipe.execute()
+                recovered_ids.extend(
+                    _id_str(member)
+                    for member, recovered in zip(stale, results, strict=True)
+                    if recovered
+                )
+            # One record for the whole run, not one per item
             if recovered_ids:
-                LOGGER.info("Recovered %d orphaned work items", len(recovered_ids))
+                LOGGER.warning(
+                    "Recovered %d orphaned work items (timeout: %d min, sample: %s)",
+                    len(recovered_ids),
+                    self.orphan_timeout_minutes,
+                    recovered_ids[:10],
+                )
+                LOGGER.debug("Recovered orphaned work items: %s", recovered_ids)
 
             return recovered_ids
 
@@ -856,6 +1343,57 @@ class RedisAdapter(BaseAdapter):
             LOGGER.error("Redis connection error during recovery: %s", e)
             raise DatabaseTemporarilyUnavailable(f"Redis connection failed: {e}")
 
+    def _index_reservations(self, processing_count: int) -> None:
+        """Add processing items missing from the reserved index to it.
+
+        Scores come from the items' reserved_at timestamps; items without
+        one are left out, as recovery can't tell how long they were reserved.
+        The processing list is read in pages of RECOVERY_BATCH_SIZE items.
+
+        Args:
+            processing_count: Length of the processing list
+        """
+        processing_key = self._key("processing")
+        timestamps_prefix = self._key_parts(self.queue_name, "timestamps")[1]
+
+        for start in range(0, processing_count, RECOVERY_BATCH_SIZE):
+            processing_items = self._client.lrange(
+                processing_key, start, start + RECOVERY_BATCH_SIZE - 1
+            )
+            if not processing_items:
+                break
+
+            # Fetch the page's reserved_at timestamps in one round trip
+            pipe = self._client.pipeline(transaction=False)
+            for member in processing_items:
+                pipe.hget(timestamps_prefix + _id_text(member), "reserved_at")
+            reserved_ats = pipe.execute()
+
+            scores = {
+                member: _timestamp(reserved_at)
+                for member, reserved_at in zip(processing_items, reserved_ats, strict=True)
+                if reserved_at
+            }
+            if scores:
+                self._client.zadd(self._key("reserved"), scores, nx=True)
+
+    def _sweep_orphans(self) -> None:
+        """Run orphan recovery every ``recovery_interval`` seconds until closed."""
+        while not self._sweeper_stop.wait(self.recovery_interval):
+            try:
+                self.recover_orphaned_work_items()
+            except Exception as e:
+                # Keep sweeping, the next run may well succeed
+                LOGGER.warning("Background orphan recovery failed: %s", e)
+
+    def close(self) -> None:
+        """Stop background orphan recovery and close the Redis connections."""
+        self._sweeper_stop.set()
+        if self._sweeper is not None:
+            self._sweeper.join()
+            self._sweeper = None
+        self._client.close()
+
     @property
     def _config(self) -> "_Config":
         return _Config(self)
@@ -5,7 +5,7 @@ Perfect for local development and small-scale deployments.
 
 Features:
 - ACID transactions
-- Concurrent read access (WAL mode)
+- Concurrent read access (WAL mode, read-only connections)
 - Filesystem-based file storage
 - Automatic schema migrations
 - Orphaned work item recovery
@@ -23,14 +23,18 @@ Usage:
         pass
 """
 
+import functools
 import json
 import logging
 import os
 import sqlite3
+import threading
 import uuid
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
 from enum import Enum
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Union
 
 from robocorp.workitems._exceptions import ApplicationException, EmptyQueue
 from robocorp.workitems._adapters._base import BaseAdapter
@@ -38,13 +42,66 @@ from robocorp.workitems._adapters._base import BaseAdapter
 # Import from local modules for drop-in replacement functionality
 from ._types import State
 from ._utils import JSONType, required_env
-from ._support import ThreadLocalConnectionPool, with_retry
+from ._support import ThreadLocalConnectionPool
 
 LOGGER = logging.getLogger(__name__)
 
+# Faster JSON codec for payloads, when installed. orjson output is decoded so
+# payloads stay TEXT and remain readable to sqlite3 tooling and json_extract.
+# Anything orjson doesn't encode like json (datetimes, dataclasses, subclasses
+# of builtins, non-str keys, integers wider than 64 bits) falls back to the
+# json module, so the payloads accepted don't depend on orjson being
+# installed. NaN and Infinity are stored as null by orjson (json writes them
+# as non-standard literals, which are still read back)
+
+
+def _json_default(obj: object) -> JSONType:
+    """Encode the types orjson serializes natively (UUID, Enum) for json."""
+    if isinstance(obj, uuid.UUID):
+        return str(obj)
+    if isinstance(obj, Enum):
+        return obj.value
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+try:  # pragma: no cover - optional dependency
+    import orjson
+
+    _ORJSON_OPTIONS = (
+        orjson.OPT_PASSTHROUGH_DATETIME
+        | orjson.OPT_PASSTHROUGH_DATACLASS
+        | orjson.OPT_PASSTHROUGH_SUBCLASS
+    )
+
+    def _orjson_default(obj: object) -> JSONType:
+        raise TypeError(f"Object of type {type(obj).__name__} is left to json")
+
+    def _json_dumps(obj: JSONType) -> str:
+        try:
+            return orjson.dumps(obj, default=_orjson_default, option=_ORJSON_OPTIONS).decode()
+        except TypeError:
+            return json.dumps(obj, default=_json_default)
+
+    def _json_loads(data: Union[bytes, str]) -> JSONType:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            return json.loads(data)
+
+except ImportError:  # pragma: no cover
+    _json_dumps = functools.partial(json.dumps, default=_json_default)
+    _json_loads = json.loads
+
 # Current schema version
 SCHEMA_VERSION = 4
 
+# How long a connection waits inside SQLite for a competing writer (ms)
+BUSY_TIMEOUT_MS = 30000
+
+# Per-connection prepared statement cache; every query text is a constant
+# string, so repeated calls reuse the compiled statement
+STATEMENT_CACHE_SIZE = 256
+
 
 class ProcessingState(str, Enum):
     """Lifecycle states persisted in the SQLite work_items table."""
@@ -117,11 +174,17 @@ class SQLiteAdapter(BaseAdapter):
         self.files_dir.mkdir(parents=True, exist_ok=True)
         Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
 
-        # Initialize connection pool
-        self._pool = ThreadLocalConnectionPool(
+        # Initialize connection pools: writes are serialized through a single
+        # writer at a time, reads go through read-only connections
+        self._write_lock = threading.Lock()
+        self._write_pool = ThreadLocalConnectionPool(
             factory=self._create_connection,
             cleanup=lambda conn: conn.close(),
         )
+        self._read_pool = ThreadLocalConnectionPool(
+            factory=self._create_read_connection,
+            cleanup=lambda conn: conn.close(),
+        )
 
         # Initialize database schema
         self._init_database()
@@ -139,17 +202,85 @@ class SQLiteAdapter(BaseAdapter):
         Returns:
             sqlite3.Connection: Configured connection with WAL mode
         """
-        conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        # Autocommit mode: write transactions are opened explicitly with
+        # BEGIN IMMEDIATE instead of sqlite3's implicit deferred BEGIN
+        conn = sqlite3.connect(
+            self.db_path,
+            check_same_thread=False,
+            isolation_level=None,
+            cached_statements=STATEMENT_CACHE_SIZE,
+        )
         conn.row_factory = sqlite3.Row
 
         # Configure WAL mode and optimizations
         conn.execute("PRAGMA journal_mode=WAL")
         conn.execute("PRAGMA synchronous=NORMAL")
         conn.execute("PRAGMA foreign_keys=ON")
-        conn.execute("PRAGMA busy_timeout=5000")
+        conn.execute(f"PRAGMA busy_timeout={BUSY_TIMEOUT_MS}")
+
+        # Size the page cache, temp store and mmap window for the commit-per-call
+        # reserve/release loop; all of these are safe under WAL
+        conn.execute("PRAGMA cache_size=-65536")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("PRAGMA mmap_size=268435456")
+        conn.execute("PRAGMA wal_autocheckpoint=1000")
+        conn.execute("PRAGMA trusted_schema=OFF")
 
         return conn
 
+    def _create_read_connection(self) -> sqlite3.Connection:
+        """Create a new read-only SQLite connection.
+
+        Returns:
+            sqlite3.Connection: Connection opened with mode=ro
+        """
+        uri = f"{Path(self.db_path).resolve().as_uri()}?mode=ro"
+        conn = sqlite3.connect(
+            uri,
+            uri=True,
+            check_same_thread=False,
+            cached_statements=STATEMENT_CACHE_SIZE,
+        )
+        conn.row_factory = sqlite3.Row
+
+        # journal_mode is persistent and already WAL; only tune the reader
+        conn.execute(f"PRAGMA busy_timeout={BUSY_TIMEOUT_MS}")
+        conn.execute("PRAGMA cache_size=-65536")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("PRAGMA mmap_size=268435456")
+        conn.execute("PRAGMA trusted_schema=OFF")
+
+        return conn
+
+    @contextmanager
+    def _get_write_conn(self):
+        """Acquire the thread's write connection, one writer at a time."""
+        with self._write_lock, self._write_pool.acquire() as conn:
+            yield conn
+
+    @contextmanager
+    def _write_transaction(self):
+        """Run the block in a BEGIN IMMEDIATE transaction on the write connection.
+
+        Taking the write lock up front means a busy database is reported at
+        BEGIN instead of when a deferred read transaction tries to upgrade.
+        The transaction is committed when the block exits and rolled back if
+        it raises.
+        """
+        with self._get_write_conn() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                if conn.in_transaction:
+                    conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+
+    def _get_read_conn(self):
+        """Acquire the thread's read-only connection."""
+        return self._read_pool.acquire()
+
     def _init_database(self):
         """Initialize database schema with migrations.
 
@@ -158,7 +289,7 @@ class SQLiteAdapter(BaseAdapter):
         Raises:
             ApplicationException: If schema version is incompatible or migration fails
         """
-        with self._pool.acquire() as conn:
+        with self._get_write_conn() as conn:
             # Create version table
             conn.execute(
                 """
@@ -168,7 +299,6 @@ class SQLiteAdapter(BaseAdapter):
                 )
             """
             )
-            conn.commit()
 
             # Detect current version
             cursor = conn.execute("SELECT MAX(version) FROM schema_version")
@@ -210,15 +340,17 @@ class SQLiteAdapter(BaseAdapter):
             ApplicationException: If migration fails
         """
         try:
+            conn.execute("BEGIN IMMEDIATE")
             migration_func(conn)
             conn.execute(
                 "INSERT INTO schema_version (version, applied_at) VALUES (?, CURRENT_TIMESTAMP)",
                 (target_version,),
             )
-            conn.commit()
+            conn.execute("COMMIT")
             LOGGER.info("Successfully migrated to version %d", target_version)
         except Exception as e:
-            conn.rollback()
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
             LOGGER.error("Migration to version %d failed: %s", target_version, e)
             raise ApplicationException(
                 f"Migration to version {target_version} failed: {e}"
@@ -328,38 +460,39 @@ class SQLiteAdapter(BaseAdapter):
             "Migration v4 (no-op: retained for forward compatibility; schema already uses COMPLETED)"
         )
 
-    @with_retry(
-        max_attempts=3,
-        backoff_factor=0.1,
-        exceptions=(sqlite3.OperationalError, DatabaseTemporarilyUnavailable),
-    )
     def reserve_input(self) -> str:
         """Reserve next pending work item from queue.
 
         Atomically reserves the oldest PENDING work item using UPDATE...RETURNING.
         Updates state to RESERVED and sets reserved_at timestamp.
 
+        Contention is handled by SQLite's busy_timeout at BEGIN IMMEDIATE;
+        since the write lock and the snapshot are taken together there is no
+        mid-transaction upgrade to retry from Python.
+
         Returns:
             str: Work item ID (UUID)
 
         Raises:
             EmptyQueue: If no pending work items available
-            DatabaseTemporarilyUnavailable: If database is temporarily locked
+            DatabaseTemporarilyUnavailable: If database stays locked past busy_timeout
         """
-        with self._pool.acquire() as conn:
-            try:
+        try:
+            with self._write_transaction() as conn:
                 LOGGER.debug(
                     "Reserving next input work item from queue: %s", self.queue_name
                 )
 
-                # Atomic reservation with RETURNING clause
+                # Atomic reservation with RETURNING clause. The pick goes by
+                # rowid, which every idx_queue_state entry already carries, so
+                # the subquery is index-only and the update is a direct seek
                 cursor = conn.execute(
                     """
                     UPDATE work_items
                     SET state = ?,
                         reserved_at = CURRENT_TIMESTAMP
-                    WHERE id = (
-                        SELECT id FROM work_items
+                    WHERE rowid = (
+                        SELECT rowid FROM work_items
                         WHERE queue_name = ? AND state = ?
                         ORDER BY created_at ASC
                         LIMIT 1
@@ -372,24 +505,20 @@ class SQLiteAdapter(BaseAdapter):
                         ProcessingState.PENDING.value,
                     ),
                 )
-
                 result = cursor.fetchone()
-                conn.commit()
 
-                if not result:
-                    raise EmptyQueue(
-                        f"No pending work items in queue: {self.queue_name}"
-                    )
+        except sqlite3.OperationalError as e:
+            if "database is locked" in str(e):
+                LOGGER.warning("Database locked after %d ms: %s", BUSY_TIMEOUT_MS, e)
+                raise DatabaseTemporarilyUnavailable(f"Database locked: {e}")
+            raise
 
-                item_id = result[0]
-                LOGGER.info("Reserved input work item: %s", item_id)
-                return item_id
+        if not result:
+            raise EmptyQueue(f"No pending work items in queue: {self.queue_name}")
 
-            except sqlite3.OperationalError as e:
-                if "database is locked" in str(e):
-                    LOGGER.warning("Database locked, retrying: %s", e)
-                    raise DatabaseTemporarilyUnavailable(f"Database locked: {e}")
-                raise
+        item_id = result[0]
+        LOGGER.info("Reserved input work item: %s", item_id)
+        return item_id
 
     def release_input(
         self,
@@ -425,7 +554,7 @@ class SQLiteAdapter(BaseAdapter):
         if state == State.FAILED and not exception_message:
             raise ValueError("exception['message'] required when state=FAILED")
 
-        with self._pool.acquire() as conn:
+        with self._write_transaction() as conn:
             conn.execute(
                 """
                 UPDATE work_items
@@ -444,7 +573,6 @@ class SQLiteAdapter(BaseAdapter):
                     item_id,
                 ),
             )
-            conn.commit()
 
         log_func = LOGGER.error if state == State.FAILED else LOGGER.info
         log_func(
@@ -476,34 +604,56 @@ class SQLiteAdapter(BaseAdapter):
         Returns:
             str: New work item ID (UUID)
         """
-        item_id = str(uuid.uuid4())
-        payload_json = json.dumps(payload if payload is not None else {})
+        return self.create_outputs_bulk(parent_id, [payload])[0]
+
+    def create_outputs_bulk(
+        self, parent_id: Optional[str], payloads: list[Optional[JSONType]]
+    ) -> list[str]:
+        """Create several output work items in a single transaction.
+
+        Equivalent to calling ``create_output`` for each payload, but all rows
+        are inserted with one executemany and committed once.
+
+        Args:
+            parent_id: Parent work item ID shared by all outputs
+            payloads: JSON payload data, one per output work item
+
+        Returns:
+            list[str]: New work item IDs, in the order of ``payloads``
+        """
         output_queue = self.output_queue_name
+        pending = ProcessingState.PENDING.value
+        rows = [
+            (
+                str(uuid.uuid4()),
+                output_queue,
+                parent_id,
+                _json_dumps(payload if payload is not None else {}),
+                pending,
+            )
+            for payload in payloads
+        ]
 
         LOGGER.debug(
-            "Creating output work item for parent %s in queue %s",
+            "Creating %d output work items for parent %s in queue %s",
+            len(rows),
             parent_id or "None",
             output_queue,
         )
 
-        with self._pool.acquire() as conn:
-            conn.execute(
-                """
-                INSERT INTO work_items (id, queue_name, parent_id, payload, state, created_at)
-                VALUES (?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
-            """,
-                (
-                    item_id,
-                    output_queue,
-                    parent_id,
-                    payload_json,
-                    ProcessingState.PENDING.value,
-                ),
-            )
-            conn.commit()
+        if rows:
+            with self._write_transaction() as conn:
+                conn.executemany(
+                    """
+                    INSERT INTO work_items (id, queue_name, parent_id, payload, state, created_at)
+                    VALUES (?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+                """,
+                    rows,
+                )
 
-        LOGGER.info("Created output work item: %s", item_id)
-        return item_id
+        item_ids = [row[0] for row in rows]
+        LOGGER.info("Created %d output work items", len(item_ids))
+        return item_ids
 
     def seed_input(
         self,
@@ -526,7 +676,7 @@ class SQLiteAdapter(BaseAdapter):
             str: New work item ID
         """
         item_id = str(uuid.uuid4())
-        payload_json = json.dumps(payload if payload is not None else {})
+        payload_json = _json_dumps(payload if payload is not None else {})
 
         LOGGER.debug(
             "Seeding input work item in queue %s with parent %s",
@@ -534,7 +684,7 @@ class SQLiteAdapter(BaseAdapter):
             parent_id or "None",
         )
 
-        with self._pool.acquire() as conn:
+        with self._write_transaction() as conn:
             conn.execute(
                 """
                 INSERT INTO work_items (id, queue_name, parent_id, payload, state, created_at)
@@ -548,7 +698,6 @@ class SQLiteAdapter(BaseAdapter):
                     ProcessingState.PENDING.value,
                 ),
             )
-            conn.commit()
 
         # Add files if provided
         if files:
@@ -570,7 +719,7 @@ class SQLiteAdapter(BaseAdapter):
         Raises:
             ValueError: If work item not found
         """
-        with self._pool.acquire() as conn:
+        with self._get_read_conn() as conn:
             cursor = conn.execute(
                 "SELECT payload FROM work_items WHERE id = ?", (item_id,)
             )
@@ -579,7 +728,7 @@ class SQLiteAdapter(BaseAdapter):
             if not result:
                 raise ValueError(f"Work item not found: {item_id}")
 
-            payload = json.loads(result[0] or "{}")
+            payload = _json_loads(result[0] or "{}")
             LOGGER.debug("Loaded payload for work item: %s", item_id)
             return payload
 
@@ -593,9 +742,9 @@ class SQLiteAdapter(BaseAdapter):
         Raises:
             ValueError: If work item not found
         """
-        payload_json = json.dumps(payload)
+        payload_json = _json_dumps(payload)
 
-        with self._pool.acquire() as conn:
+        with self._write_transaction() as conn:
             cursor = conn.execute(
                 "UPDATE work_items SET payload = ? WHERE id = ?",
                 (payload_json, item_id),
@@ -604,7 +753,6 @@ class SQLiteAdapter(BaseAdapter):
             if cursor.rowcount == 0:
                 raise ValueError(f"Work item not found: {item_id}")
 
-            conn.commit()
             LOGGER.debug("Saved payload for work item: %s", item_id)
 
     def list_files(self, item_id: str) -> list[str]:
@@ -616,7 +764,7 @@ class SQLiteAdapter(BaseAdapter):
         Returns:
             list[str]: List of filenames
         """
-        with self._pool.acquire() as conn:
+        with self._get_read_conn() as conn:
             cursor = conn.execute(
                 "SELECT filename FROM work_item_files WHERE work_item_id = ? ORDER BY filename",
                 (item_id,),
@@ -638,7 +786,7 @@ class SQLiteAdapter(BaseAdapter):
         Raises:
             ValueError: If file not found or missing from filesystem
         """
-        with self._pool.acquire() as conn:
+        with self._get_read_conn() as conn:
             cursor = conn.execute(
                 "SELECT filepath FROM work_item_files WHERE work_item_id = ? AND filename = ?",
                 (item_id, name),
@@ -688,7 +836,7 @@ class SQLiteAdapter(BaseAdapter):
         filepath.write_bytes(content)
 
         # Create database record
-        with self._pool.acquire() as conn:
+        with self._write_transaction() as conn:
             try:
                 conn.execute(
                     """
@@ -697,7 +845,6 @@ class SQLiteAdapter(BaseAdapter):
                 """,
                     (item_id, name, str(filepath)),
                 )
-                conn.commit()
             except sqlite3.IntegrityError:
                 # Cleanup file if database insert fails
                 filepath.unlink(missing_ok=True)
@@ -717,7 +864,7 @@ class SQLiteAdapter(BaseAdapter):
         Raises:
             ValueError: If file not found
         """
-        with self._pool.acquire() as conn:
+        with self._write_transaction() as conn:
             # Get filepath from database
             cursor = conn.execute(
                 "SELECT filepath FROM work_item_files WHERE work_item_id = ? AND filename = ?",
@@ -737,41 +884,44 @@ class SQLiteAdapter(BaseAdapter):
                 "DELETE FROM work_item_files WHERE work_item_id = ? AND filename = ?",
                 (item_id, name),
             )
-            conn.commit()
 
-            # Delete from filesystem
-            filepath.unlink(missing_ok=True)
-            LOGGER.debug("Removed file: %s", name)
+        # Delete from filesystem once the reference is gone
+        filepath.unlink(missing_ok=True)
+        LOGGER.debug("Removed file: %s", name)
 
     def recover_orphaned_work_items(self) -> list[str]:
         """Recover orphaned work items beyond timeout.
 
         Resets RESERVED work items to PENDING if they've been reserved longer
-        than the configured timeout threshold.
+        than the configured timeout threshold. The cutoff is computed here in
+        CURRENT_TIMESTAMP's format so the filter is a plain range scan on
+        idx_orphan_check.
 
         Returns:
             list[str]: List of recovered work item IDs
         """
-        with self._pool.acquire() as conn:
-            modifier = f"+{self.orphan_timeout_minutes} minutes"
+        cutoff = datetime.now(timezone.utc) - timedelta(
+            minutes=self.orphan_timeout_minutes
+        )
+
+        with self._write_transaction() as conn:
             cursor = conn.execute(
                 """
                     UPDATE work_items
                     SET state = ?,
                         reserved_at = NULL
                     WHERE state = ?
-                    AND datetime(reserved_at, ?) < datetime('now')
+                    AND reserved_at < ?
                     RETURNING id
                 """,
                 (
                     ProcessingState.PENDING.value,
                     ProcessingState.RESERVED.value,
-                    modifier,
+                    cutoff.strftime("%Y-%m-%d %H:%M:%S"),
                 ),
             )
 
             recovered_ids = [row[0] for row in cursor.fetchall()]
-            conn.commit()
 
             if recovered_ids:
                 LOGGER.warning(
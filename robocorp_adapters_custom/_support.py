@@ -6,6 +6,7 @@ adapters, including connection pooling, retry logic, and migration helpers.
 
 import functools
 import logging
+import random
 import threading
 import time
 from contextlib import contextmanager
@@ -13,6 +14,8 @@ from typing import Any, Callable, Generic, Optional, TypeVar
 
 from robocorp.workitems._exceptions import ApplicationException
 
+from .exceptions import CircuitBreakerOpen
+
 LOGGER = logging.getLogger(__name__)
 
 T = TypeVar("T")
@@ -85,10 +88,94 @@ class ThreadLocalConnectionPool(Generic[T]):
             )
 
 
+class CircuitBreaker:
+    """Fails calls fast after repeated consecutive failures.
+
+    After ``threshold`` consecutive failures the breaker opens and ``check``
+    raises CircuitBreakerOpen for ``cooldown`` seconds. After the cooldown the
+    breaker is half-open: a single call is let through as a probe while all
+    others keep failing fast. A success closes the breaker, a failure opens
+    it again. A probe that never reports back is replaced by a new one after
+    another cooldown.
+
+    Example:
+        breaker = CircuitBreaker(threshold=5, cooldown=30.0)
+
+        breaker.check()
+        try:
+            result = query_database()
+        except ConnectionError:
+            breaker.record_failure()
+            raise
+        breaker.record_success()
+    """
+
+    def __init__(self, threshold: int = 5, cooldown: float = 30.0):
+        """Initialize the circuit breaker.
+
+        Args:
+            threshold: Consecutive failures that open the breaker
+            cooldown: Seconds the breaker stays open
+        """
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        # monotonic() of the half-open probe in flight, if any
+        self._probe_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def check(self) -> None:
+        """Raise CircuitBreakerOpen if calls are currently short-circuited."""
+        if self._opened_at is None:
+            return
+        with self._lock:
+            if self._opened_at is None:
+                return
+            now = time.monotonic()
+            remaining = self.cooldown - (now - self._opened_at)
+            if remaining > 0:
+                raise CircuitBreakerOpen(
+                    f"Circuit breaker open after {self._failures} consecutive failures; "
+                    f"retry in {remaining:.1f}s"
+                )
+            if self._probe_at is not None and now - self._probe_at < self.cooldown:
+                raise CircuitBreakerOpen(
+                    f"Circuit breaker half-open after {self._failures} consecutive "
+                    f"failures; waiting for the probe call"
+                )
+            self._probe_at = now
+
+    def record_success(self) -> None:
+        """Reset the failure count and close the breaker."""
+        if self._failures:
+            with self._lock:
+                self._failures = 0
+                self._opened_at = None
+                self._probe_at = None
+
+    def record_failure(self) -> None:
+        """Count a failure, opening the breaker at the threshold."""
+        with self._lock:
+            self._failures += 1
+            self._probe_at = None
+            if self._failures >= self.threshold:
+                if self._opened_at is None:
+                    LOGGER.warning(
+                        "Circuit breaker opened after %d consecutive failures",
+                        self._failures,
+                    )
+                self._opened_at = time.monotonic()
+
+
 def with_retry(
     max_attempts: int = 3,
     backoff_factor: float = 1.0,
     exceptions: tuple = (Exception,),
+    max_delay: Optional[float] = None,
+    max_wait: Optional[float] = None,
+    jitter: bool = False,
+    breaker: Optional[str] = None,
 ) -> Callable:
     """Decorator that retries a function on failure with exponential backoff.
 
@@ -96,6 +183,14 @@ def with_retry(
         max_attempts: Maximum number of attempts (including initial call)
         backoff_factor: Base delay between retries in seconds
         exceptions: Tuple of exception types to catch and retry
+        max_delay: Upper bound for a single delay in seconds
+        max_wait: Total time budget in seconds; no retry is scheduled past it
+        jitter: Scale each delay by a random factor in [0.5, 1.5) so that
+            concurrent callers don't retry in lockstep
+        breaker: Name of a CircuitBreaker attribute on the instance the
+            decorated method is bound to. Retryable failures are recorded on
+            it, and calls fail fast with CircuitBreakerOpen while it is open.
+            Any other exception counts as a success, as the backend answered
 
     Example:
         @with_retry(max_attempts=3, backoff_factor=0.5)
@@ -106,15 +201,42 @@ def with_retry(
     def decorator(func: Callable) -> Callable:
         @functools.wraps(func)
         def wrapper(*args, **kwargs):
+            circuit: Optional[CircuitBreaker] = getattr(args[0], breaker) if breaker else None
+            deadline = time.monotonic() + max_wait if max_wait is not None else None
             last_exception = None
 
             for attempt in range(max_attempts):
+                if circuit is not None:
+                    circuit.check()
                 try:
-                    return func(*args, **kwargs)
+                    result = func(*args, **kwargs)
                 except exceptions as e:
                     last_exception = e
-                    if attempt < max_attempts - 1:
-                        delay = backoff_factor * (2**attempt)
+                    if circuit is not None:
+                        circuit.record_failure()
+
+                    delay = backoff_factor * (2**attempt)
+                    if max_delay is not None:
+                        delay = min(delay, max_delay)
+                    if jitter:
+                        delay *= random.uniform(0.5, 1.5)
+
+                    if attempt == max_attempts - 1:
+                        LOGGER.error(
+                            "All %d attempts failed. Last error: %s",
+                            max_attempts,
+                            e,
+                        )
+                    elif deadline is not None and time.monotonic() + delay > deadline:
+                        LOGGER.error(
+                            "Retry budget of %.1fs exhausted after %d attempts. "
+                            "Last error: %s",
+                            max_wait,
+                            attempt + 1,
+                            e,
+                        )
+                        break
+                    else:
                         LOGGER.warning(
                             "Attempt %d/%d failed: %s. Retrying in %.2fs...",
                             attempt + 1,
@@ -123,12 +245,15 @@ def with_retry(
                             delay,
                         )
                         time.sleep(delay)
-                    else:
-                        LOGGER.error(
-                            "All %d attempts failed. Last error: %s",
-                            max_attempts,
-                            e,
-                        )
+                except Exception:
+                    # Not retryable (e.g. EmptyQueue): the backend answered
+                    if circuit is not None:
+                        circuit.record_success()
+                    raise
+                else:
+                    if circuit is not None:
+                        circuit.record_success()
+                    return result
 
             # All attempts exhausted, raise the last exception
             if last_exception:
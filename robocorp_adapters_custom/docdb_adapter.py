@@ -0,0 +1,3 @@
+"""Legacy import path kept for existing ``RC_WORKITEM_ADAPTER`` configs."""
+
+from ._docdb import DocumentDBAdapter  # noqa: F401
@@ -15,6 +15,7 @@ class AdapterError(RuntimeError):
 
     Subclass this for adapter-specific error conditions:
         - DatabaseTemporarilyUnavailable
+        - CircuitBreakerOpen
         - ConnectionPoolExhausted
         - SchemaVersionMismatch
     """
@@ -34,6 +35,19 @@ class DatabaseTemporarilyUnavailable(AdapterError):
     """
 
 
+class CircuitBreakerOpen(DatabaseTemporarilyUnavailable):
+    """Calls are short-circuited after repeated database failures.
+
+    Raised without contacting the database while the adapter's circuit
+    breaker is open, i.e. for a cooldown window after several consecutive
+    operations failed. Retrying immediately only adds load.
+
+    Solutions:
+        - Back off for the cooldown window before retrying
+        - Check database health and connectivity
+    """
+
+
 class ConnectionPoolExhausted(AdapterError):
     """Connection pool has no available connections.
 
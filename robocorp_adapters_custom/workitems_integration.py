@@ -22,10 +22,12 @@ Usage:
     payload = adapter.load_payload(item_id)
 """
 
+import functools
 import importlib
 import logging
 import os
-from typing import Optional
+import threading
+from typing import Callable, Optional
 
 from robocorp.workitems._adapters._base import BaseAdapter
 
@@ -38,11 +40,43 @@ LOGGER = logging.getLogger(__name__)
 
 # Global adapter instance (singleton per process)
 _adapter_instance: Optional[BaseAdapter] = None
+_adapter_lock = threading.Lock()
 
 
+def _import_adapter(module_path: str, class_name: str) -> Callable[[], type]:
+    """Return a factory that imports ``class_name`` from ``module_path`` on call."""
+    return lambda: getattr(importlib.import_module(module_path), class_name)
+
+
+_SQLITE = _import_adapter("robocorp_adapters_custom._sqlite", "SQLiteAdapter")
+_REDIS = _import_adapter("robocorp_adapters_custom._redis", "RedisAdapter")
+_DOCDB = _import_adapter("robocorp_adapters_custom._docdb", "DocumentDBAdapter")
+_YORKO = _import_adapter(
+    "robocorp_adapters_custom._yorko_control_room", "YorkoControlRoomAdapter"
+)
+
+# Adapters shipped with this package, including the legacy module paths still
+# used by existing RC_WORKITEM_ADAPTER configs. Other paths go through importlib.
+_ADAPTER_REGISTRY: dict[str, Callable[[], type]] = {
+    "robocorp_adapters_custom._sqlite.SQLiteAdapter": _SQLITE,
+    "robocorp_adapters_custom.sqlite_adapter.SQLiteAdapter": _SQLITE,
+    "robocorp_adapters_custom._redis.RedisAdapter": _REDIS,
+    "robocorp_adapters_custom.redis_adapter.RedisAdapter": _REDIS,
+    "robocorp_adapters_custom._docdb.DocumentDBAdapter": _DOCDB,
+    "robocorp_adapters_custom.docdb_adapter.DocumentDBAdapter": _DOCDB,
+    "robocorp_adapters_custom._yorko_control_room.YorkoControlRoomAdapter": _YORKO,
+}
+
+
+@functools.lru_cache(maxsize=None)
 def load_adapter_class(adapter_class_path: str) -> type[BaseAdapter]:
     """Dynamically import and return adapter class.
 
+    Adapters shipped with this package are resolved from a static registry;
+    other paths are imported dynamically. Results are cached per class path,
+    so repeated lookups skip the import machinery. Failed lookups are not
+    cached.
+
     Args:
         adapter_class_path: Full Python path to adapter class
                            (e.g., "robocorp_adapters_custom.sqlite_adapter.SQLiteAdapter")
@@ -60,14 +94,18 @@ def load_adapter_class(adapter_class_path: str) -> type[BaseAdapter]:
         adapter = adapter_cls()  # Instantiate with __init__
     """
     try:
-        # Split into module path and class name
-        module_path, class_name = adapter_class_path.rsplit(".", 1)
+        factory = _ADAPTER_REGISTRY.get(adapter_class_path)
+        if factory is not None:
+            adapter_class = factory()
+        else:
+            # Split into module path and class name
+            module_path, class_name = adapter_class_path.rsplit(".", 1)
 
-        # Import module
-        module = importlib.import_module(module_path)
+            # Import module
+            module = importlib.import_module(module_path)
 
-        # Get class from module
-        adapter_class = getattr(module, class_name)
+            # Get class from module
+            adapter_class = getattr(module, class_name)
 
         # Verify it's a BaseAdapter subclass
         if not issubclass(adapter_class, BaseAdapter):
@@ -177,13 +215,18 @@ def get_adapter_instance(reinitialize: bool = False) -> Optional[BaseAdapter]:
     if _adapter_instance is not None and not reinitialize:
         return _adapter_instance
 
-    # Initialize new adapter
-    try:
-        _adapter_instance = initialize_adapter()
-        return _adapter_instance
-    except Exception as e:
-        LOGGER.error("Failed to get adapter instance: %s", e)
-        raise
+    with _adapter_lock:
+        # Another thread may have initialized the adapter while we waited
+        if _adapter_instance is not None and not reinitialize:
+            return _adapter_instance
+
+        # Initialize new adapter
+        try:
+            _adapter_instance = initialize_adapter()
+            return _adapter_instance
+        except Exception as e:
+            LOGGER.error("Failed to get adapter instance: %s", e)
+            raise
 
 
 def is_custom_adapter_enabled() -> bool:
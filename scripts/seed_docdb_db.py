@@ -8,18 +8,87 @@ Compatible with Amazon DocumentDB clusters and supports callid-based duplicate p
 import json
 import os
 import sys
-import base64
+import binascii
 import argparse
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 
 # Add project root to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+# Work items sent per bulk insert
+SEED_BATCH_SIZE = 500
+
+# C JSON parser for large work item files, when installed. Files orjson
+# rejects (NaN/Infinity literals, numbers out of double range) are parsed
+# with the json module instead. orjson reads integers wider than 64 bits,
+# which BSON can't store either, as floats
+try:
+    import orjson
+
+    def _json_loads(data):
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            return json.loads(data)
+
+except ImportError:
+    _json_loads = json.loads
+
+
+def _seed_in_batches(adapter, batch):
+    """Seed with one bulk insert per chunk.
+
+    Yields (entry, item_id, error) per entry; item_id is None for duplicates.
+    """
+    for start in range(0, len(batch), SEED_BATCH_SIZE):
+        chunk = batch[start : start + SEED_BATCH_SIZE]
+        try:
+            results = adapter.seed_input_batch(
+                [(payload, file_tuples, callid) for _, payload, file_tuples, callid in chunk]
+            )
+        except Exception as e:
+            # Raised before anything was inserted (the callid lookup failed)
+            for entry in chunk:
+                yield entry, None, e
+            continue
+        for entry, (item_id, error) in zip(chunk, results, strict=True):
+            yield entry, item_id, error
+
+
+def _seed_one(adapter, payload, file_tuples, callid):
+    """Seed one work item, returning its ID or None for a duplicate callid.
+
+    Attachments given as a Path are streamed from disk by the adapter.
+    """
+    try:
+        return adapter.seed_input(payload=payload, files=file_tuples, callid=callid)
+    except ValueError as e:
+        if "already exists" in str(e) and callid:
+            return None
+        raise
+
+
+def _seed_concurrently(adapter, batch, workers):
+    """Seed items one by one on a thread pool, overlapping their round trips.
+
+    Yields (entry, item_id, error) per entry, in completion order.
+    """
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            executor.submit(_seed_one, adapter, *entry[1:]): entry for entry in batch
+        }
+        for future in as_completed(futures):
+            try:
+                yield futures[future], future.result(), None
+            except Exception as e:
+                yield futures[future], None, e
+
 
 def load_env(env_json: Path):
     """Load environment variables from JSON file."""
     if env_json and env_json.exists():
-        data = json.loads(env_json.read_text())
+        data = _json_loads(env_json.read_bytes())
         for k, v in data.items():
             os.environ[k] = os.path.expandvars(v)
 
@@ -43,6 +112,15 @@ def main():
     ap.add_argument(
         "--callid-field", help="Field name to use as callid for duplicate prevention"
     )
+    ap.add_argument(
+        "--quiet", action="store_true", help="Only print the summary, not every item"
+    )
+    ap.add_argument(
+        "--no-bulk",
+        action="store_true",
+        help="Seed items one by one, SEED_CONCURRENCY (default 16) at a time, "
+        "instead of in bulk inserts",
+    )
     args = ap.parse_args()
 
     # Load environment configuration
@@ -76,11 +154,11 @@ def main():
 
     # Load work items from JSON
     try:
-        items = json.loads(Path(args.json).read_text())
+        items = _json_loads(Path(args.json).read_bytes())
     except FileNotFoundError:
         print(f"Error: Work items file not found: {args.json}")
         sys.exit(1)
-    except json.JSONDecodeError as e:
+    except ValueError as e:  # json.JSONDecodeError, orjson.JSONDecodeError
         print(f"Error: Invalid JSON in work items file: {e}")
         sys.exit(1)
 
@@ -103,10 +181,11 @@ def main():
         print("- DOCDB_TLS_CERT (if using AWS DocumentDB)")
         sys.exit(1)
 
-    # Seed work items
+    # Collect work items and their attachments
     created = 0
     duplicates = 0
     errors = 0
+    batch = []
 
     for i, wi in enumerate(items):
         try:
@@ -125,43 +204,57 @@ def main():
             for file_info in wi.get("files", []):
                 name = file_info["name"]
                 if "content_base64" in file_info:
-                    content = base64.b64decode(file_info["content_base64"])
+                    # Decodes the ASCII text directly, without a bytes copy first
+                    content = binascii.a2b_base64(file_info["content_base64"])
                 elif "path" in file_info:
                     file_path = Path(file_info["path"])
-                    if not file_path.exists():
+                    if not file_path.is_file():
                         print(f"Warning: File not found: {file_path}")
                         continue
-                    try:
-                        content = file_path.read_bytes()
-                    except (OSError, IOError) as e:
-                        print(f"Warning: Could not read file {file_path}: {e}")
+                    if not os.access(file_path, os.R_OK):
+                        print(f"Warning: Could not read file {file_path}")
                         continue
+                    # Streamed from disk by the adapter, not loaded here
+                    content = file_path
                 else:
                     print(f"Warning: Invalid file info for item {i}: {file_info}")
                     continue
                 file_tuples.append((name, content))
 
-            # Create work item
-            item_id = adapter.seed_input(
-                payload=payload, files=file_tuples, callid=callid
-            )
-            created += 1
+            batch.append((i, payload, file_tuples, callid))
 
-            # Show progress
-            payload_preview = str(list(payload.keys())[:6])
-            if len(list(payload.keys())) > 6:
-                payload_preview = payload_preview[:-1] + ", ...]"
+        except Exception as e:
+            errors += 1
+            print(f"✗ error seeding item {i}: {e}")
 
-            callid_info = f" (callid: {callid})" if callid else ""
-            print(f"✓ seeded {item_id} payload keys={payload_preview}{callid_info}")
+    # Seed work items
+    if args.no_bulk:
+        workers = int(os.getenv("SEED_CONCURRENCY", "16"))
+        results = _seed_concurrently(adapter, batch, workers)
+    else:
+        results = _seed_in_batches(adapter, batch)
 
-        except Exception as e:
-            if "already exists" in str(e) and callid:
-                duplicates += 1
-                print(f"⚠ skipped duplicate callid: {callid}")
-            else:
-                errors += 1
-                print(f"✗ error seeding item {i}: {e}")
+    for (i, payload, _, callid), item_id, error in results:
+        if error is not None:
+            errors += 1
+            print(f"✗ error seeding item {i}: {error}")
+            continue
+        if item_id is None:
+            duplicates += 1
+            print(f"⚠ skipped duplicate callid: {callid}")
+            continue
+        created += 1
+        if args.quiet:
+            continue
+
+        # Show progress
+        keys = list(payload)
+        payload_preview = str(keys[:6])
+        if len(keys) > 6:
+            payload_preview = payload_preview[:-1] + ", ...]"
+
+        callid_info = f" (callid: {callid})" if callid else ""
+        print(f"✓ seeded {item_id} payload keys={payload_preview}{callid_info}")
 
     # Summary
     print(f"\n{'='*50}")
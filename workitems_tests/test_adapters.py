@@ -1,11 +1,16 @@
 # ruff: noqa: E501
+import base64
 import copy
+import functools
 import importlib
+import importlib.util
 import json
 import logging
 import os
+import sqlite3
 import tempfile
 import time
+import uuid
 from contextlib import contextmanager
 from pathlib import Path
 from unittest import mock
@@ -547,6 +552,30 @@ class TestAdapterFactory:
             DocumentDBAdapter()
 
 
+class TestPackageExports:
+    def test_lazy_exports_resolve(self):
+        import robocorp_adapters_custom as package
+
+        assert isinstance(package.__all__, tuple)
+        for name in package.__all__:
+            assert getattr(package, name) is not None
+            assert name in dir(package)
+
+        assert package.SQLiteAdapter is SQLiteAdapter
+        assert package.RedisAdapter is RedisAdapter
+
+    def test_missing_optional_dependency(self, monkeypatch):
+        import robocorp_adapters_custom as package
+
+        monkeypatch.delitem(vars(package), "RedisAdapter", raising=False)
+        monkeypatch.setitem(
+            package._OPTIONAL_DEPENDENCIES, "RedisAdapter", (False, "redis")
+        )
+
+        with pytest.raises(AttributeError, match=r"pip install redis"):
+            getattr(package, "RedisAdapter")  # noqa: B009
+
+
 class TestSQLiteAdapter:
     """Integration tests for SQLiteAdapter with real database operations.
 
@@ -600,7 +629,7 @@ class TestSQLiteAdapter:
 
     def test_database_initialization(self, adapter):
         """Test that the database initializes with proper schema."""
-        with adapter._pool.acquire() as conn:
+        with adapter._write_pool.acquire() as conn:
             cursor = conn.execute("SELECT name FROM sqlite_master WHERE type='table'")
             tables = {row[0] for row in cursor.fetchall()}
 
@@ -608,6 +637,26 @@ class TestSQLiteAdapter:
         assert "work_item_files" in tables
         assert "schema_version" in tables
 
+    def test_reserve_pick_uses_covering_index(self, adapter):
+        """Test that the oldest-pending lookup is served from the index alone."""
+        with adapter._write_pool.acquire() as conn:
+            plan = conn.execute(
+                "EXPLAIN QUERY PLAN SELECT rowid FROM work_items "
+                "WHERE queue_name = ? AND state = ? ORDER BY created_at ASC LIMIT 1",
+                ("test_queue", "PENDING"),
+            ).fetchall()
+
+        assert "COVERING INDEX idx_queue_state" in plan[0][-1]
+
+    def test_connection_pragmas(self, adapter):
+        """Test that connections are tuned for the reserve/release workload."""
+        with adapter._write_pool.acquire() as conn:
+            assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+            assert conn.execute("PRAGMA cache_size").fetchone()[0] == -65536
+            assert conn.execute("PRAGMA temp_store").fetchone()[0] == 2
+            assert conn.execute("PRAGMA wal_autocheckpoint").fetchone()[0] == 1000
+            assert conn.execute("PRAGMA trusted_schema").fetchone()[0] == 0
+
     def test_reserve_and_release_workflow(self, adapter):
         """Test full reserve → process → release workflow."""
         # Create item using seed_input helper
@@ -627,13 +676,93 @@ class TestSQLiteAdapter:
         adapter.release_input(reserved_id, State.DONE)
 
         # Verify state
-        with adapter._pool.acquire() as conn:
+        with adapter._write_pool.acquire() as conn:
             cursor = conn.execute(
                 "SELECT state FROM work_items WHERE id = ?", (reserved_id,)
             )
             row = cursor.fetchone()
             assert row[0] == State.DONE.value
 
+    def test_read_connections_are_read_only(self, adapter):
+        """Test that reads go through connections that cannot write."""
+        item_id = adapter.seed_input({"data": "test"})
+
+        with adapter._get_read_conn() as conn:
+            with pytest.raises(sqlite3.OperationalError, match="readonly"):
+                conn.execute("DELETE FROM work_items WHERE id = ?", (item_id,))
+
+        assert adapter.load_payload(item_id) == {"data": "test"}
+
+    def test_create_outputs_bulk(self, adapter):
+        """Test that bulk-created outputs land in the output queue in order."""
+        parent_id = adapter.seed_input({"data": "parent"})
+
+        output_ids = adapter.create_outputs_bulk(parent_id, [{"n": 1}, None, {"n": 3}])
+
+        assert len(output_ids) == 3
+        assert [adapter.load_payload(item_id) for item_id in output_ids] == [
+            {"n": 1},
+            {},
+            {"n": 3},
+        ]
+        with adapter._write_pool.acquire() as conn:
+            rows = conn.execute(
+                "SELECT queue_name, parent_id, state FROM work_items WHERE id = ?",
+                (output_ids[0],),
+            ).fetchone()
+        assert tuple(rows) == (adapter.output_queue_name, parent_id, "PENDING")
+        assert adapter.create_outputs_bulk(parent_id, []) == []
+
+    def test_recover_orphaned_work_items(self, adapter):
+        """Test that only items reserved past the timeout go back to PENDING."""
+        stale_id = adapter.seed_input({"n": 1})
+        fresh_id = adapter.seed_input({"n": 2})
+        assert adapter.reserve_input() == stale_id
+        assert adapter.reserve_input() == fresh_id
+
+        with adapter._write_pool.acquire() as conn:
+            conn.execute(
+                "UPDATE work_items SET reserved_at = datetime('now', '-31 minutes') "
+                "WHERE id = ?",
+                (stale_id,),
+            )
+
+        assert adapter.recover_orphaned_work_items() == [stale_id]
+        assert adapter.reserve_input() == stale_id
+
+    def test_reserve_input_reports_lock_without_retrying(self, adapter, tmp_path):
+        """Test that a held write lock surfaces once busy_timeout expires."""
+        from robocorp_adapters_custom._sqlite import DatabaseTemporarilyUnavailable
+
+        adapter.seed_input({"data": "test"})
+        with adapter._write_pool.acquire() as conn:
+            conn.execute("PRAGMA busy_timeout=50")
+
+        blocker = sqlite3.connect(tmp_path / "test_workitems.db", isolation_level=None)
+        blocker.execute("BEGIN IMMEDIATE")
+        try:
+            start = time.monotonic()
+            with pytest.raises(DatabaseTemporarilyUnavailable):
+                adapter.reserve_input()
+            assert time.monotonic() - start < 1
+        finally:
+            blocker.execute("ROLLBACK")
+            blocker.close()
+
+        assert adapter.reserve_input()
+
+    def test_write_transaction_rolls_back_on_error(self, adapter):
+        """Test that writes run in explicit transactions that roll back on error."""
+        item_id = adapter.seed_input({"data": "test"})
+
+        with pytest.raises(RuntimeError):
+            with adapter._write_transaction() as conn:
+                assert conn.in_transaction
+                conn.execute("DELETE FROM work_items WHERE id = ?", (item_id,))
+                raise RuntimeError("boom")
+
+        assert adapter.load_payload(item_id) == {"data": "test"}
+
     def test_payload_operations(self, adapter):
         """Test payload save and load."""
         # create_output goes to OUTPUT queue - that's fine for this test
@@ -647,6 +776,14 @@ class TestSQLiteAdapter:
         loaded = adapter.load_payload(item_id)
         assert loaded == new_payload
 
+        with adapter._write_pool.acquire() as conn:
+            row = conn.execute(
+                "SELECT typeof(payload), json_extract(payload, '$.key') "
+                "FROM work_items WHERE id = ?",
+                (item_id,),
+            ).fetchone()
+        assert tuple(row) == ("text", "updated")
+
     def test_file_operations(self, adapter):
         """Test file upload and download."""
         item_id = adapter.create_output(None, {})
@@ -700,7 +837,7 @@ class TestSQLiteAdapter:
         adapter.release_input(reserved_id, State.FAILED, exception=exception)
 
         # Verify state and exception stored
-        with adapter._pool.acquire() as conn:
+        with adapter._write_pool.acquire() as conn:
             cursor = conn.execute(
                 "SELECT state, exception_message FROM work_items WHERE id = ?",
                 (reserved_id,),
@@ -772,6 +909,49 @@ class TestSQLiteAdapter:
         with pytest.raises(FileExistsError):
             adapter.add_file(item_id, "test.txt", b"different content")
 
+    def test_payload_json_edge_cases(self, adapter):
+        """Test wide integers round-trip and non-finite floats are stored."""
+        module = importlib.import_module("robocorp.workitems._adapters._sqlite")
+        item_id = adapter.seed_input({"big": 2**64, "n": -(2**70)})
+        assert adapter.load_payload(item_id) == {"big": 2**64, "n": -(2**70)}
+
+        adapter.save_payload(item_id, {"nan": float("nan"), "inf": float("inf")})
+        payload = adapter.load_payload(item_id)
+        if hasattr(module, "orjson"):
+            # orjson has no representation for them and writes null
+            assert payload == {"nan": None, "inf": None}
+        else:
+            assert payload["inf"] == float("inf")
+
+        # Non-standard literals, as written by the json module, still load
+        assert module._json_loads('{"x": Infinity}') == {"x": float("inf")}
+
+    def test_payload_types_accepted_without_orjson(self, adapter):
+        """Test the payloads accepted are the same with and without orjson."""
+        import dataclasses
+        from datetime import datetime
+
+        module = importlib.import_module("robocorp.workitems._adapters._sqlite")
+
+        @dataclasses.dataclass
+        class Point:
+            x: int
+
+        item_id = adapter.seed_input({})
+        with pytest.raises(TypeError):
+            adapter.save_payload(item_id, {"t": datetime(2024, 1, 1)})
+
+        json_only = functools.partial(json.dumps, default=module._json_default)
+        for dumps in (module._json_dumps, json_only):
+            for rejected in (datetime(2024, 1, 1), Point(1), {uuid.UUID(int=1): 1}):
+                with pytest.raises(TypeError):
+                    dumps({"value": rejected})
+            accepted = {"id": uuid.UUID(int=1), 1: True}
+            assert json.loads(dumps(accepted)) == {
+                "id": "00000000-0000-0000-0000-000000000001",
+                "1": True,
+            }
+
     def test_error_handling_invalid_work_item(self, adapter):
         """Test operations on non-existent work items."""
         fake_id = "nonexistent-item-id"
@@ -800,7 +980,7 @@ class TestSQLiteAdapter:
         item_id = adapter.create_output(None, {"test": "data"})
         
         # Check the database to verify the queue name
-        with adapter._pool.acquire() as conn:
+        with adapter._write_pool.acquire() as conn:
             cursor = conn.execute(
                 "SELECT queue_name FROM work_items WHERE id = ?",
                 (item_id,),
@@ -828,7 +1008,7 @@ class TestSQLiteAdapter:
         item_id = adapter.create_output(None, {"test": "data"})
         
         # Check the database to verify the queue name
-        with adapter._pool.acquire() as conn:
+        with adapter._write_pool.acquire() as conn:
             cursor = conn.execute(
                 "SELECT queue_name FROM work_items WHERE id = ?",
                 (item_id,),
@@ -838,6 +1018,11 @@ class TestSQLiteAdapter:
             assert row[0] == "qa_forms_output"
 
 
+def _packed_id(item_id):
+    """Return a work item UUID as the RedisAdapter stores it in Redis."""
+    return b"\xff" + uuid.UUID(item_id).bytes
+
+
 def _create_redis_input_item(adapter, payload):
     """Helper to create item directly in Redis INPUT queue for testing."""
     import json
@@ -861,7 +1046,9 @@ def _create_redis_input_item(adapter, payload):
         adapter._key("timestamps", queue=adapter._config.queue, item_id=item_id),
         mapping={"created_at": now},
     )
-    adapter._client.lpush(adapter._key("pending", queue=adapter._config.queue), item_id)
+    adapter._client.lpush(
+        adapter._key("pending", queue=adapter._config.queue), _packed_id(item_id)
+    )
     adapter._client.set(
         adapter._key("origin", item_id=item_id),
         adapter._config.queue,
@@ -951,6 +1138,25 @@ class TestRedisAdapter:
         payload = adapter.load_payload(reserved_id)
         assert payload["data"] == "test"
 
+    def test_reserve_records_state_and_timestamp(self, adapter):
+        """Test reservation marks the item RESERVED and stamps reserved_at."""
+        item_id = adapter.seed_input({})
+        adapter.reserve_input()
+
+        client = adapter._client
+        assert client.hget(adapter._key("payload", item_id=item_id), "state") == b"RESERVED"
+        assert client.hget(adapter._key("timestamps", item_id=item_id), "reserved_at")
+
+    def test_reserve_blocking(self, adapter):
+        """Test blocking reservation with RC_WORKITEM_BLOCK_TIMEOUT set."""
+        adapter.block_timeout = 1
+        item_id = adapter.seed_input({})
+
+        assert adapter.reserve_input() == item_id
+        client = adapter._client
+        assert client.hget(adapter._key("payload", item_id=item_id), "state") == b"RESERVED"
+        assert client.hget(adapter._key("timestamps", item_id=item_id), "reserved_at")
+
     def test_payload_persistence(self, adapter):
         """Test payload save and load with Redis."""
         item_id = adapter.seed_input({"initial": "value"})
@@ -983,6 +1189,54 @@ class TestRedisAdapter:
         adapter.remove_file(item_id, "data.json")
         assert adapter.list_files(item_id) == ["small.txt"]
 
+    def test_inline_file_stored_as_raw_bytes(self, adapter):
+        """Test inline files are stored unencoded and legacy base64 entries still read."""
+        item_id = adapter.seed_input({})
+        content = bytes(range(256))
+        adapter.add_file(item_id, "binary.bin", content)
+
+        files_key = adapter._key("files", item_id=item_id)
+        assert adapter._client.hget(files_key, "binary.bin") == b"\x00" + content
+        assert adapter.get_file(item_id, "binary.bin") == content
+
+        adapter._client.hset(files_key, "legacy.txt", base64.b64encode(b"Legacy"))
+        assert adapter.get_file(item_id, "legacy.txt") == b"Legacy"
+
+        adapter.remove_file(item_id, "binary.bin")
+        assert adapter.list_files(item_id) == ["legacy.txt"]
+
+    def test_seed_input_with_files(self, adapter):
+        """Test seeding an item together with its files."""
+        item_id = adapter.seed_input({}, files=[("a.txt", b"A"), ("b.bin", b"\xffB")])
+
+        assert set(adapter.list_files(item_id)) == {"a.txt", "b.bin"}
+        assert adapter.get_file(item_id, "b.bin") == b"\xffB"
+
+        with pytest.raises(ValueError):
+            adapter.seed_input({}, files=[("a.txt", b"A"), ("a.txt", b"B")])
+
+    def test_add_file_from_path(self, adapter, monkeypatch, tmp_path):
+        """Test attaching files from disk, inline and on the filesystem."""
+        module = importlib.import_module("robocorp.workitems._adapters._redis")
+        monkeypatch.setattr(module, "INLINE_FILE_THRESHOLD", 10)
+        adapter.files_dir = tmp_path / "files"
+        item_id = adapter.seed_input({})
+
+        small_path = tmp_path / "small.txt"
+        small_path.write_bytes(b"Small")
+        large_path = tmp_path / "large.bin"
+        large_path.write_bytes(b"L" * 100)
+        adapter.add_file_from_path(item_id, "small.txt", small_path)
+        adapter.add_file_from_path(item_id, "large.bin", large_path)
+
+        assert adapter.get_file(item_id, "small.txt") == b"Small"
+        assert adapter.get_file(item_id, "large.bin") == b"L" * 100
+        assert (adapter.files_dir / item_id / "large.bin").exists()
+        files_key = adapter._key("files", item_id=item_id)
+        assert 0 < adapter._client.ttl(files_key) <= TTL_WEEK_SECONDS
+        with pytest.raises(FileExistsError):
+            adapter.add_file_from_path(item_id, "small.txt", small_path)
+
     def test_fifo_ordering(self, adapter):
         """Test FIFO queue ordering in Redis."""
         # Create multiple items
@@ -1045,6 +1299,361 @@ class TestRedisAdapter:
         payload = adapter.load_payload(reserved_id)
         assert payload["will"] == "fail"
 
+    def test_release_records_terminal_state(self, adapter):
+        """Test release moves the item to its terminal set and stores the exception."""
+        adapter.seed_input({})
+        reserved_id = adapter.reserve_input()
+
+        exception = {"type": "RuntimeError", "message": "Something went wrong"}
+        adapter.release_input(reserved_id, State.FAILED, exception=exception)
+
+        client = adapter._client
+        assert client.lrange(adapter._key("processing"), 0, -1) == []
+        assert client.sismember(adapter._key("failed"), _packed_id(reserved_id))
+        assert client.get(adapter._key("state", item_id=reserved_id)) == b"FAILED"
+        assert client.hget(adapter._key("payload", item_id=reserved_id), "state") == b"FAILED"
+        assert (
+            client.hget(adapter._key("exception", item_id=reserved_id), "message")
+            == b"Something went wrong"
+        )
+
+    def test_create_output_writes_item_keys(self, adapter):
+        """Test create_output stores the item's keys with the week TTL."""
+        parent_id = adapter.seed_input({})
+        output_id = adapter.create_output(parent_id, {"out": 1})
+        output_queue = adapter.output_queue_name
+
+        client = adapter._client
+        parent_key = adapter._key("parent", queue=output_queue, item_id=output_id)
+        assert client.get(parent_key) == parent_id.encode()
+        assert 0 < client.ttl(parent_key) <= TTL_WEEK_SECONDS
+        assert client.get(adapter._key("origin", item_id=output_id)) == output_queue.encode()
+        assert client.lrange(adapter._key("pending", queue=output_queue), 0, -1) == [
+            _packed_id(output_id)
+        ]
+        assert adapter.load_payload(output_id) == {"out": 1}
+
+    def test_item_keys_use_text_ids(self, adapter):
+        """Test item keys are named queue:suffix:id with the text form of the ID."""
+        item_id = adapter.seed_input({"a": 1})
+        key = f"test_queue:payload:{item_id}".encode()
+        assert adapter._key("payload", item_id=item_id) == key
+        assert adapter._key("payload", item_id=_packed_id(item_id)) == key
+
+        assert adapter.reserve_input() == item_id
+        client = adapter._client
+        assert client.hget(key, "state") == b"RESERVED"
+        assert client.hget(f"test_queue:timestamps:{item_id}", "reserved_at")
+
+    def test_item_ids_stored_as_uuid_bytes(self, adapter):
+        """Test work item IDs are kept in Redis as a tag byte and 16 raw bytes."""
+        item_id = adapter.seed_input({})
+        assert adapter._client.lrange(adapter._key("pending"), 0, -1) == [
+            _packed_id(item_id)
+        ]
+
+        assert adapter.reserve_input() == item_id
+        adapter.release_input(item_id, State.DONE)
+        assert adapter._client.smembers(adapter._key("done")) == {_packed_id(item_id)}
+
+    def test_item_ids_round_trip_exactly(self, adapter):
+        """Test IDs that aren't canonical UUIDs are stored and read back as text."""
+        module = importlib.import_module("robocorp.workitems._adapters._redis")
+        canonical = str(uuid.uuid4())
+        for item_id in (
+            canonical,
+            canonical.upper(),
+            canonical.replace("-", ""),
+            "{" + canonical + "}",
+            "sixteen-chars-id",
+        ):
+            assert module._id_str(module._id_bytes(item_id)) == item_id
+
+        # A 36-character text member (as stored by earlier versions) decodes as is
+        assert module._id_str(canonical.encode()) == canonical
+
+        item_id = "sixteen-chars-id"
+        adapter._client.hset(
+            adapter._key("payload", item_id=item_id),
+            mapping={"payload": "{}", "queue_name": "test_queue", "state": "PENDING"},
+        )
+        adapter._client.lpush(adapter._key("pending"), item_id)
+        assert adapter.reserve_input() == item_id
+        assert adapter.load_payload(item_id) == {}
+
+    def test_items_from_earlier_versions_are_readable(self, adapter):
+        """Test items stored with text ID members are processed without migration."""
+        client = adapter._client
+        pending_id, done_id, reserved_id = str(uuid.uuid4()), "order-42", str(uuid.uuid4())
+        for item_id in (pending_id, done_id, reserved_id):
+            client.hset(
+                f"test_queue:payload:{item_id}",
+                mapping={"payload": json.dumps({"id": item_id}), "queue_name": "test_queue"},
+            )
+            client.hset(f"test_queue:files:{item_id}", "a.txt", base64.b64encode(b"A"))
+        client.lpush("test_queue:pending", pending_id)
+        client.lpush("test_queue:processing", reserved_id)
+        client.sadd("test_queue:done", done_id)
+
+        assert adapter.load_payload(done_id) == {"id": done_id}
+        assert adapter.get_file(done_id, "a.txt") == b"A"
+        assert adapter.reserve_input() == pending_id
+        assert adapter.get_file(pending_id, "a.txt") == b"A"
+
+        adapter.release_input(reserved_id, State.DONE)
+        assert client.lrange("test_queue:processing", 0, -1) == [pending_id.encode()]
+
+    def test_reservation_from_earlier_version_is_recovered(self, adapter):
+        """Test an item reserved by an earlier version is recovered when stale."""
+        from datetime import datetime, timedelta
+
+        client = adapter._client
+        item_id = str(uuid.uuid4())
+        reserved_at = datetime.utcnow() - timedelta(minutes=adapter.orphan_timeout_minutes + 5)
+        client.hset(
+            f"test_queue:payload:{item_id}",
+            mapping={"payload": "{}", "queue_name": "test_queue", "state": "RESERVED"},
+        )
+        client.hset(f"test_queue:timestamps:{item_id}", "reserved_at", reserved_at.isoformat())
+        client.lpush("test_queue:processing", item_id)
+
+        assert adapter.recover_orphaned_work_items() == [item_id]
+        assert adapter.reserve_input() == item_id
+
+    def test_payload_json_edge_cases(self, adapter):
+        """Test wide integers round-trip and non-finite floats are stored."""
+        module = importlib.import_module("robocorp.workitems._adapters._redis")
+        item_id = adapter.seed_input({"big": 2**64, "n": -(2**70)})
+        assert adapter.load_payload(item_id) == {"big": 2**64, "n": -(2**70)}
+
+        adapter.save_payload(item_id, {"nan": float("nan"), "inf": float("inf")})
+        payload = adapter.load_payload(item_id)
+        if hasattr(module, "orjson"):
+            # orjson has no representation for them and writes null
+            assert payload == {"nan": None, "inf": None}
+        else:
+            assert payload["inf"] == float("inf")
+
+        # Non-standard literals, as written by the json module, still load
+        adapter._client.hset(adapter._key("payload", item_id=item_id), "payload", '{"x": NaN}')
+        assert adapter.load_payload(item_id)["x"] != adapter.load_payload(item_id)["x"]
+
+    def test_payload_types_accepted_without_orjson(self, adapter):
+        """Test the payloads accepted are the same with and without orjson."""
+        import dataclasses
+        import enum
+        from datetime import datetime
+
+        module = importlib.import_module("robocorp.workitems._adapters._redis")
+
+        class Color(enum.Enum):
+            RED = "red"
+
+        @dataclasses.dataclass
+        class Point:
+            x: int
+
+        item_id = adapter.seed_input({})
+        with pytest.raises(ValueError, match="not JSON-serializable"):
+            adapter.save_payload(item_id, {"t": datetime(2024, 1, 1)})
+
+        json_only = functools.partial(json.dumps, default=module._json_default)
+        for dumps in (module._json_dumps, json_only):
+            for rejected in (datetime(2024, 1, 1), Point(1), {Color.RED: 1}):
+                with pytest.raises(TypeError):
+                    dumps({"value": rejected})
+            accepted = {"id": uuid.UUID(int=1), "color": Color.RED, 1: True}
+            assert json.loads(dumps(accepted)) == {
+                "id": "00000000-0000-0000-0000-000000000001",
+                "color": "red",
+                "1": True,
+            }
+
+    def test_save_payload_requires_existing_item(self, adapter):
+        """Test save_payload doesn't recreate an item whose keys expired."""
+        item_id = adapter.seed_input({"a": 1})
+        adapter.save_payload(item_id, {"a": 2})
+        assert adapter.load_payload(item_id) == {"a": 2}
+
+        payload_key = adapter._key("payload", item_id=item_id)
+        adapter._client.delete(payload_key)
+        with pytest.raises(ValueError):
+            adapter.save_payload(item_id, {"a": 3})
+        assert not adapter._client.exists(payload_key)
+
+    def test_create_outputs_bulk(self, adapter):
+        """Test bulk-created outputs match create_output, in payload order."""
+        parent_id = adapter.seed_input({})
+        output_ids = adapter.create_outputs_bulk(parent_id, [{"n": 1}, None, {"n": 3}])
+        output_queue = adapter.output_queue_name
+
+        assert len(set(output_ids)) == 3
+        assert [adapter.load_payload(output_id) for output_id in output_ids] == [
+            {"n": 1},
+            {},
+            {"n": 3},
+        ]
+        parent_key = adapter._key("parent", queue=output_queue, item_id=output_ids[1])
+        assert adapter._client.get(parent_key) == parent_id.encode()
+        assert adapter._client.lrange(adapter._key("pending", queue=output_queue), 0, -1) == [
+            _packed_id(output_id) for output_id in reversed(output_ids)
+        ]
+        assert adapter.create_outputs_bulk(parent_id, []) == []
+
+    def test_load_payload_resolves_queue(self, adapter):
+        """Test load_payload finds input and output items without a cached queue."""
+        input_id = adapter.seed_input({"in": 1})
+        output_id = adapter.create_output(input_id, {"out": 1})
+        adapter._queue_cache.clear()
+
+        assert adapter.load_payload(input_id) == {"in": 1}
+        assert adapter.load_payload(output_id) == {"out": 1}
+        assert adapter._queue_cache == {
+            input_id: adapter.queue_name,
+            output_id: adapter.output_queue_name,
+        }
+
+    def test_resolve_item_queue_reads_origin(self, adapter):
+        """Test queue resolution follows the origin key, probing without one."""
+        input_id = adapter.seed_input({})
+        output_id = adapter.create_output(input_id, {})
+        adapter._client.set(adapter._key("origin", item_id=output_id), "elsewhere")
+        adapter._client.delete(adapter._key("origin", item_id=input_id))
+        adapter._queue_cache.clear()
+
+        assert adapter._resolve_item_queue(output_id) == "elsewhere"
+        assert adapter._resolve_item_queue(input_id) == adapter.queue_name
+        with pytest.raises(ValueError):
+            adapter._resolve_item_queue(str(uuid.uuid4()))
+
+    def test_queue_cache_evicts_least_recently_used(self, adapter, monkeypatch):
+        """Test the resolved-queue cache is bounded and evicts in LRU order."""
+        module = importlib.import_module("robocorp.workitems._adapters._redis")
+        monkeypatch.setattr(module, "QUEUE_CACHE_SIZE", 2)
+        first, second, third = (adapter.seed_input({}) for _ in range(3))
+        adapter._queue_cache.clear()
+
+        adapter._resolve_item_queue(first)
+        adapter._resolve_item_queue(second)
+        adapter._resolve_item_queue(first)
+        adapter._resolve_item_queue(third)
+
+        assert list(adapter._queue_cache) == [first, third]
+
+    def test_recover_orphaned_work_items(self, adapter):
+        """Test only items reserved beyond the timeout are returned to pending."""
+        from datetime import datetime, timedelta
+
+        stale_id = adapter.seed_input({"stale": True})
+        fresh_id = adapter.seed_input({"stale": False})
+        assert adapter.reserve_input() == stale_id
+        assert adapter.reserve_input() == fresh_id
+
+        # Reserved by an earlier version: ISO timestamp and no index entry
+        stale_at = datetime.utcnow() - timedelta(minutes=adapter.orphan_timeout_minutes + 1)
+        adapter._client.hset(
+            adapter._key("timestamps", item_id=stale_id), "reserved_at", stale_at.isoformat()
+        )
+        adapter._client.zrem(adapter._key("reserved"), _packed_id(stale_id))
+
+        assert adapter.recover_orphaned_work_items() == [stale_id]
+        assert adapter._client.lrange(adapter._key("processing"), 0, -1) == [
+            _packed_id(fresh_id)
+        ]
+        assert adapter.reserve_input() == stale_id
+
+    def test_recover_orphaned_work_items_in_batches(self, adapter, monkeypatch, caplog):
+        """Test recovery pages through the processing list and the index."""
+        module = importlib.import_module("robocorp.workitems._adapters._redis")
+        monkeypatch.setattr(module, "RECOVERY_BATCH_SIZE", 2)
+        item_ids = [adapter.seed_input({"n": n}) for n in range(5)]
+        for _ in item_ids:
+            adapter.reserve_input()
+
+        # Unindexed, as if reserved by an earlier version
+        stale_at = time.time() - (adapter.orphan_timeout_minutes + 1) * 60
+        adapter._client.delete(adapter._key("reserved"))
+        for item_id in item_ids:
+            adapter._client.hset(
+                adapter._key("timestamps", item_id=item_id), "reserved_at", stale_at
+            )
+
+        with caplog.at_level(logging.WARNING):
+            assert sorted(adapter.recover_orphaned_work_items()) == sorted(item_ids)
+        recovery_logs = [r for r in caplog.records if r.message.startswith("Recovered")]
+        assert len(recovery_logs) == 1
+        assert adapter._client.llen(adapter._key("processing")) == 0
+        assert adapter._client.zcard(adapter._key("reserved")) == 0
+
+    def test_background_orphan_recovery(self, adapter, monkeypatch):
+        """Test RC_WORKITEM_RECOVERY_INTERVAL recovers orphans on a thread."""
+        item_id = adapter.seed_input({})
+        assert adapter.reserve_input() == item_id
+
+        monkeypatch.setenv("RC_WORKITEM_ORPHAN_TIMEOUT_MINUTES", "0")
+        monkeypatch.setenv("RC_WORKITEM_RECOVERY_INTERVAL", "0.05")
+        sweeping = RedisAdapter()
+        try:
+            deadline = time.time() + 5
+            while adapter._client.llen(adapter._key("processing")) and time.time() < deadline:
+                time.sleep(0.05)
+        finally:
+            sweeping.close()
+
+        assert sweeping._sweeper is None
+        assert adapter._client.lrange(adapter._key("pending"), 0, -1) == [
+            _packed_id(item_id)
+        ]
+
+    def test_recover_script_skips_rereserved_item(self, adapter):
+        """Test the recovery script leaves items re-reserved after the cutoff."""
+        item_id = adapter.seed_input({})
+        assert adapter.reserve_input() == item_id
+        member = _packed_id(item_id)
+        keys = [
+            adapter._key("processing"),
+            adapter._key("pending"),
+            adapter._key("reserved"),
+            adapter._key("timestamps", item_id=item_id),
+            adapter._key("payload", item_id=item_id),
+        ]
+        reserved_at = adapter._client.zscore(keys[2], member)
+
+        assert adapter._recover_script(keys=keys, args=[member, reserved_at, "PENDING"]) == 0
+        assert adapter._client.lrange(adapter._key("processing"), 0, -1) == [member]
+
+        cutoff = reserved_at + 1
+        assert adapter._recover_script(keys=keys, args=[member, cutoff, "PENDING"]) == 1
+        assert adapter._client.lrange(adapter._key("pending"), 0, -1) == [member]
+        assert adapter._client.zscore(keys[2], member) is None
+        assert adapter._client.hget(keys[4], "state") == b"PENDING"
+
+    def test_release_removes_reserved_index_entry(self, adapter):
+        """Test released items leave the reserved index."""
+        item_id = adapter.seed_input({})
+        assert adapter.reserve_input() == item_id
+        assert adapter._client.zcard(adapter._key("reserved")) == 1
+
+        adapter.release_input(item_id, State.DONE)
+        assert adapter._client.zcard(adapter._key("reserved")) == 0
+
+    def test_timestamps_stored_as_epoch_seconds(self, adapter):
+        """Test timestamps are epoch seconds and compared numerically on recovery."""
+        item_id = adapter.seed_input({})
+        before = time.time()
+        assert adapter.reserve_input() == item_id
+
+        timestamps_key = adapter._key("timestamps", item_id=item_id)
+        reserved_at = float(adapter._client.hget(timestamps_key, "reserved_at"))
+        assert before <= reserved_at <= time.time()
+
+        reserved_key = adapter._key("reserved")
+        assert adapter._client.zscore(reserved_key, _packed_id(item_id)) == reserved_at
+
+        stale_at = time.time() - (adapter.orphan_timeout_minutes + 1) * 60
+        adapter._client.zadd(reserved_key, {_packed_id(item_id): stale_at})
+        assert adapter.recover_orphaned_work_items() == [item_id]
+
     def test_error_handling_file_not_found(self, adapter):
         """Test FileNotFoundError for non-existent files."""
         item_id = adapter.seed_input({})
@@ -1256,6 +1865,98 @@ class TestDocumentDBAdapter:
         files = adapter.list_files(item_id)
         assert files == ["small.txt"]
 
+    def test_get_files(self, adapter):
+        """Test fetching several inline and GridFS files in one call."""
+        item_id = adapter.seed_input({})
+        large_content = b"X" * 10000
+        adapter.add_file(item_id, "large.bin", large_content)
+        adapter.add_file(item_id, "small.txt", b"Small")
+
+        assert adapter.get_files(item_id) == {
+            "large.bin": large_content,
+            "small.txt": b"Small",
+        }
+        assert adapter.get_files(item_id, ["small.txt"]) == {"small.txt": b"Small"}
+        with pytest.raises(FileNotFoundError):
+            adapter.get_files(item_id, ["missing.txt"])
+
+    def test_get_file_to_path(self, adapter, tmp_path):
+        """Test writing inline and GridFS files straight to disk."""
+        item_id = adapter.seed_input({})
+        large_content = b"X" * 10000
+        adapter.add_file(item_id, "large.bin", large_content)
+        adapter.add_file(item_id, "small.txt", b"Small")
+
+        large_path = adapter.get_file_to_path(item_id, "large.bin", tmp_path / "large.bin")
+        assert large_path.read_bytes() == large_content
+        small_path = adapter.get_file_to_path(item_id, "small.txt", tmp_path / "small.txt")
+        assert small_path.read_bytes() == b"Small"
+
+    def test_add_file_from_path(self, adapter, tmp_path):
+        """Test attaching inline and GridFS files from disk."""
+        item_id = adapter.seed_input({})
+        large_path = tmp_path / "large.bin"
+        large_path.write_bytes(os.urandom(600_000))
+        small_path = tmp_path / "small.txt"
+        small_path.write_bytes(b"Small")
+
+        adapter.add_file_from_path(item_id, "large.bin", large_path)
+        adapter.add_file_from_path(item_id, "small.txt", small_path)
+
+        assert adapter.get_file(item_id, "large.bin") == large_path.read_bytes()
+        assert adapter.get_file(item_id, "small.txt") == b"Small"
+        with pytest.raises(FileExistsError):
+            adapter.add_file_from_path(item_id, "small.txt", small_path)
+
+    def test_duplicate_gridfs_file_leaves_no_orphan(self, adapter):
+        """Test a rejected duplicate does not leave its GridFS upload behind."""
+        adapter.file_threshold = 1000
+        item_id = adapter.seed_input({})
+        adapter.add_file(item_id, "large.bin", b"X" * 10000)
+        uploaded = adapter._db["fs.files"].count_documents({})
+
+        with pytest.raises(FileExistsError):
+            adapter.add_file(item_id, "large.bin", b"Y" * 10000)
+
+        assert adapter._db["fs.files"].count_documents({}) == uploaded
+        assert adapter.get_file(item_id, "large.bin") == b"X" * 10000
+
+    def test_remove_gridfs_file(self, adapter):
+        """Test removing a GridFS file deletes its content, even if that fails midway."""
+        from pymongo.errors import ConnectionFailure  # type: ignore[import-not-found]
+
+        adapter.file_threshold = 1000
+        item_id = adapter.seed_input({})
+        adapter.add_file(item_id, "a.bin", os.urandom(10000))
+        adapter.add_file(item_id, "b.bin", os.urandom(10000))
+        gridfs_id = adapter._load_file_entry(item_id, "a.bin")["gridfs_id"]
+
+        adapter.remove_file(item_id, "a.bin")
+        assert adapter._db["fs.files"].count_documents({"_id": gridfs_id}) == 0
+        assert adapter._db["fs.chunks"].count_documents({"files_id": gridfs_id}) == 0
+
+        with mock.patch.object(
+            adapter, "_delete_gridfs", side_effect=ConnectionFailure("connection reset")
+        ):
+            adapter.remove_file(item_id, "b.bin")
+        assert adapter.list_files(item_id) == []
+
+    def test_gridfs_chunk_size_grows_with_file_size(self, adapter):
+        """Test large files are uploaded in larger GridFS chunks."""
+        small = adapter._gridfs_chunk_size_for(2 * 1024 * 1024)
+        large = adapter._gridfs_chunk_size_for(32 * 1024 * 1024)
+
+        assert small == adapter.gridfs_chunk_size
+        assert large == 4 * 1024 * 1024
+
+    def test_gridfs_multi_chunk_roundtrip(self, adapter):
+        """Test files spanning several GridFS chunks are reassembled in order."""
+        item_id = adapter.seed_input({})
+        content = os.urandom(600_000)  # > 2 default-sized chunks
+
+        adapter.add_file(item_id, "multi.bin", content)
+        assert adapter.get_file(item_id, "multi.bin") == content
+
     def test_fifo_ordering(self, adapter):
         """Test FIFO ordering with MongoDB queries."""
         ids = []
@@ -1272,6 +1973,163 @@ class TestDocumentDBAdapter:
 
         assert reserved == ids
 
+    def test_recover_orphaned_work_items(self, adapter):
+        """Test stale reservations are returned to pending and reported."""
+        from datetime import datetime, timedelta
+
+        stale_id = adapter.seed_input({"n": 1})
+        fresh_id = adapter.seed_input({"n": 2})
+        assert adapter.reserve_input() == stale_id
+        assert adapter.reserve_input() == fresh_id
+        adapter._collection().update_one(
+            {"item_id": stale_id},
+            {"$set": {"timestamps.reserved_at": datetime.utcnow() - timedelta(days=1)}},
+        )
+
+        assert adapter.recover_orphaned_work_items() == [stale_id]
+        assert adapter.reserve_input() == stale_id
+
+    def test_seed_input_duplicate_callid(self, adapter):
+        """Test callid is unique per queue while items without one never clash."""
+        adapter.seed_input({"n": 1}, callid="call-1")
+        adapter.seed_input({"n": 2})
+        adapter.seed_input({"n": 3})
+
+        with pytest.raises(ValueError, match="already exists"):
+            adapter.seed_input({"n": 4}, callid="call-1")
+
+    def test_seed_input_failure_leaves_no_gridfs_orphan(self, adapter):
+        """Test files uploaded for an item whose insert fails are deleted again."""
+        adapter.file_threshold = 1000
+        adapter.seed_input({"n": 1}, callid="call-1")
+        uploaded = adapter._db["fs.files"].count_documents({})
+
+        with pytest.raises(ValueError, match="already exists"):
+            adapter.seed_input({"n": 2}, files=[("large.bin", b"X" * 10000)], callid="call-1")
+        with pytest.raises(FileExistsError):
+            adapter.seed_input({"n": 3}, files=[("a.bin", b"X" * 10000), ("a.bin", b"Y")])
+
+        assert adapter._db["fs.files"].count_documents({}) == uploaded
+
+    def test_seed_input_many(self, adapter):
+        """Test bulk seeding creates one pending item per payload."""
+        ids = adapter.seed_input_many([{"n": 0}, {"n": 1}, None])
+        assert len(ids) == 3
+
+        reserved = {adapter.reserve_input() for _ in range(3)}
+        assert reserved == set(ids)
+        assert adapter.load_payload(ids[2]) == {}
+
+    def test_seed_input_batch(self, adapter):
+        """Test batch seeding stores files and skips existing callids."""
+        adapter.seed_input({"n": 0}, callid="call-0")
+        results = adapter.seed_input_batch(
+            [
+                ({"n": 1}, [("a.txt", b"A")], "call-1"),
+                ({"n": 2}, [], "call-0"),
+                (None, [("b.txt", b"B"), ("c.txt", b"C")], None),
+                ({"n": 4}, [], "call-1"),
+            ]
+        )
+        ids = [item_id for item_id, _ in results]
+
+        assert all(error is None for _, error in results)
+        assert ids[1] is None and ids[3] is None
+        assert adapter.load_payload(ids[0]) == {"n": 1}
+        assert adapter.get_file(ids[0], "a.txt") == b"A"
+        assert sorted(adapter.list_files(ids[2])) == ["b.txt", "c.txt"]
+        assert adapter.seed_input_batch([({}, [], "call-1")]) == [(None, None)]
+
+    def test_seed_input_batch_reports_failures_per_item(self, adapter, tmp_path):
+        """Test a bad item fails on its own and leaves no GridFS upload behind."""
+        adapter.file_threshold = 1000
+        large = b"X" * 10000
+        uploaded = adapter._db["fs.files"].count_documents({})
+
+        results = adapter.seed_input_batch(
+            [
+                ({"n": 1}, [("a.bin", large), ("a.bin", large)], None),
+                ({"n": 2}, [("big.bin", large), ("gone.bin", tmp_path / "missing")], None),
+                ({"n": 3}, [("big.bin", large)], "call-3"),
+            ]
+        )
+
+        assert results[0][0] is None and isinstance(results[0][1], FileExistsError)
+        assert results[1][0] is None and isinstance(results[1][1], FileNotFoundError)
+        item_id, error = results[2]
+        assert error is None
+        assert adapter.get_file(item_id, "big.bin") == large
+        assert adapter._db["fs.files"].count_documents({}) == uploaded + 1
+
+    def test_seed_input_batch_reports_rejected_inserts_per_item(self, adapter):
+        """Test insert errors fail only the rejected items and drop their uploads."""
+        from pymongo.errors import BulkWriteError  # type: ignore[import-not-found]
+
+        adapter.file_threshold = 1000
+        uploaded = adapter._db["fs.files"].count_documents({})
+        collection = adapter._collection()
+        insert_many = collection.insert_many
+
+        def reject_first(docs, ordered):
+            insert_many(docs[1:], ordered=ordered)
+            raise BulkWriteError(
+                {"writeErrors": [{"index": 0, "code": 121, "errmsg": "validation failed"}]}
+            )
+
+        with mock.patch.object(collection, "insert_many", side_effect=reject_first):
+            results = adapter.seed_input_batch(
+                [({"n": 1}, [("big.bin", b"X" * 10000)], None), ({"n": 2}, [], None)]
+            )
+
+        assert results[0][0] is None
+        assert "validation failed" in str(results[0][1])
+        assert results[1][1] is None
+        assert adapter.load_payload(results[1][0]) == {"n": 2}
+        assert adapter._db["fs.files"].count_documents({}) == uploaded
+
+    def test_seed_script_reads_non_standard_json(self):
+        """Test the seed script reads the literals orjson rejects."""
+        path = Path(__file__).parent.parent / "scripts" / "seed_docdb_db.py"
+        spec = importlib.util.spec_from_file_location("seed_docdb_db", path)
+        script = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(script)
+
+        items = script._json_loads(b'[{"payload": {"a": NaN, "b": Infinity, "c": 1e400}}]')
+        payload = items[0]["payload"]
+        assert payload["a"] != payload["a"]
+        assert payload["b"] == payload["c"] == float("inf")
+        assert script._json_loads(b'{"n": 9007199254740993}') == {"n": 9007199254740993}
+
+    def test_seed_input_batch_streams_files_from_path(self, adapter, tmp_path):
+        """Test batch seeding accepts attachments as paths, GridFS-sized or not."""
+        adapter.file_threshold = 1000
+        small = tmp_path / "small.txt"
+        small.write_bytes(b"small")
+        large = tmp_path / "large.bin"
+        large.write_bytes(os.urandom(5000))
+
+        [(item_id, _)] = adapter.seed_input_batch(
+            [({}, [("small.txt", small), ("large.bin", large)], None)]
+        )
+        assert adapter.get_file(item_id, "small.txt") == b"small"
+        assert adapter.get_file(item_id, "large.bin") == large.read_bytes()
+
+    def test_seed_input_streams_files_from_path(self, adapter, tmp_path):
+        """Test seed_input streams GridFS-sized attachments given as paths."""
+        adapter.file_threshold = 1000
+        small = tmp_path / "small.txt"
+        small.write_bytes(b"small")
+        large = tmp_path / "large.bin"
+        large.write_bytes(os.urandom(5000))
+
+        read_bytes = Path.read_bytes
+        with mock.patch.object(Path, "read_bytes", autospec=True, side_effect=read_bytes) as read:
+            item_id = adapter.seed_input({}, files=[("small.txt", small), ("large.bin", large)])
+
+        assert [call.args[0] for call in read.call_args_list] == [small]
+        assert adapter.get_file(item_id, "small.txt") == b"small"
+        assert adapter.get_file(item_id, "large.bin") == large.read_bytes()
+
     def test_atomic_reservation(self, adapter):
         """Test that find_one_and_update provides atomic reservations."""
         # Create items
@@ -1372,11 +2230,23 @@ class TestDocumentDBAdapter:
         with pytest.raises(ValueError):
             adapter.remove_file(item_id, "ghost.txt")
 
+    def test_queue_resolution_is_cached(self, adapter):
+        """Seeded and created items resolve their queue without a lookup."""
+        input_id = adapter.seed_input({})
+        output_id = adapter.create_output(input_id, {})
+
+        assert adapter._queue_cache[input_id] == adapter.queue_name
+        assert adapter._queue_cache[output_id] == adapter.output_queue_name
+
+        adapter._queue_cache.clear()
+        assert adapter._resolve_item_queue(output_id) == adapter.output_queue_name
+        assert adapter._queue_cache[output_id] == adapter.output_queue_name
+
     def test_file_size_threshold_inline_vs_gridfs(self, adapter):
         """Test that files are stored inline vs GridFS based on size threshold."""
         item_id = adapter.seed_input({})
 
-        # Small file - should be inline (base64)
+        # Small file - should be inline (BSON binary)
         small_content = b"Small file content"
         adapter.add_file(item_id, "small.txt", small_content)
 
@@ -1392,13 +2262,154 @@ class TestDocumentDBAdapter:
         coll = adapter._collection()
         doc = coll.find_one({"item_id": item_id})
 
-        # Small file should be base64 string
-        assert isinstance(doc["files"]["small.txt"], str)
+        # Small file should be stored as raw binary
+        assert bytes(doc["files"]["small.txt"]) == small_content
 
         # Large file should be GridFS reference
         assert isinstance(doc["files"]["large.bin"], dict)
         assert "gridfs_id" in doc["files"]["large.bin"]
 
+    def test_circuit_breaker_fails_fast(self, adapter):
+        """Test repeated connection failures open the breaker and skip the database."""
+        from pymongo.errors import ConnectionFailure  # type: ignore[import-not-found]
+
+        from robocorp_adapters_custom._support import CircuitBreaker
+        from robocorp_adapters_custom.exceptions import CircuitBreakerOpen
+
+        adapter._breaker = CircuitBreaker(threshold=2, cooldown=60.0)
+        collection = mock.Mock()
+        collection.find_one.side_effect = ConnectionFailure("connection refused")
+
+        with (
+            mock.patch.object(adapter, "_collection", return_value=collection),
+            mock.patch("time.sleep", return_value=None),
+        ):
+            with pytest.raises(CircuitBreakerOpen):
+                adapter.load_payload("missing-id")
+            assert collection.find_one.call_count == 2
+
+            with pytest.raises(CircuitBreakerOpen):
+                adapter.load_payload("missing-id")
+            assert collection.find_one.call_count == 2
+
+    def test_circuit_breaker_half_open_admits_one_probe(self):
+        """Test only one call gets through after the cooldown until it reports back."""
+        from robocorp_adapters_custom._support import CircuitBreaker
+        from robocorp_adapters_custom.exceptions import CircuitBreakerOpen
+
+        breaker = CircuitBreaker(threshold=1, cooldown=0.05)
+        breaker.record_failure()
+        with pytest.raises(CircuitBreakerOpen):
+            breaker.check()
+
+        time.sleep(0.06)
+        breaker.check()
+        with pytest.raises(CircuitBreakerOpen, match="half-open"):
+            breaker.check()
+
+        breaker.record_failure()
+        with pytest.raises(CircuitBreakerOpen, match="retry in"):
+            breaker.check()
+
+        time.sleep(0.06)
+        breaker.check()
+        breaker.record_success()
+        breaker.check()
+        breaker.check()
+
+    def test_circuit_breaker_closes_on_non_retryable_probe_error(self):
+        """Test a probe failing with a non-retryable error closes the breaker."""
+        from robocorp.workitems._exceptions import EmptyQueue
+
+        from robocorp_adapters_custom._support import CircuitBreaker, with_retry
+
+        class Backend:
+            _breaker = CircuitBreaker(threshold=1, cooldown=0.05)
+
+            @with_retry(max_attempts=1, exceptions=(ConnectionError,), breaker="_breaker")
+            def call(self, result):
+                if isinstance(result, Exception):
+                    raise result
+                return result
+
+        backend = Backend()
+        with pytest.raises(ConnectionError):
+            backend.call(ConnectionError("down"))
+
+        time.sleep(0.06)
+        with pytest.raises(EmptyQueue):
+            backend.call(EmptyQueue("empty"))
+        assert backend.call("ok") == "ok"
+
+    def test_close_via_context_manager(self, adapter):
+        """Test the adapter closes its client once, on exit or explicit close."""
+        with mock.patch.object(adapter._client, "close") as mock_close:
+            with adapter as entered:
+                assert entered is adapter
+            adapter.close()
+
+        mock_close.assert_called_once_with()
+
+    def test_compressible_file_stored_zstd(self, adapter):
+        """Test compressible files are stored zstd-compressed and read back intact."""
+        pytest.importorskip("zstandard")
+        item_id = adapter.seed_input({})
+        content = b'{"row": "value"}\n' * 1000
+        adapter.add_file(item_id, "rows.json", content)
+
+        _, entry = adapter._collection().find_one({"item_id": item_id})["files"].resolve(
+            "rows.json"
+        )
+        assert entry["codec"] == "zstd"
+        assert len(entry["content"]) < len(content)
+        assert adapter.get_file(item_id, "rows.json") == content
+
+        # The processed document's files mapping returns file bytes, not frames
+        doc = adapter._collection().find_one({"item_id": item_id})
+        assert doc["files"]["rows.json"] == content
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            dest = adapter.get_file_to_path(item_id, "rows.json", Path(tmpdir) / "rows.json")
+            assert dest.read_bytes() == content
+
+    def test_file_lookup_projects_only_requested_file(self, adapter):
+        """Test reading one file fetches only that file's entry, not the whole map."""
+        item_id = adapter.seed_input({"big": "x" * 1000})
+        adapter.add_file(item_id, "a.txt", b"A")
+        adapter.add_file(item_id, "b.txt", b"B")
+
+        collection = adapter._collection()
+        with mock.patch.object(collection, "find_one", wraps=collection.find_one) as find_one:
+            assert adapter.get_file(item_id, "a.txt") == b"A"
+
+        key = adapter._make_file_key("a.txt")
+        projection = find_one.call_args_list[-1].args[1]
+        assert [field for field in projection if field.startswith("files")] == [f"files.{key}"]
+        assert adapter._file_projection(["legacy"]) == {
+            f"files.{adapter._make_file_key('legacy')}": 1,
+            "files.legacy": 1,
+        }
+
+    def test_legacy_base64_inline_file(self, adapter):
+        """Test inline files written as base64 text before binary storage still read."""
+        item_id = adapter.seed_input({})
+        adapter._collection().update_one(
+            {"item_id": item_id},
+            {
+                "$set": {
+                    "files.legacy": {
+                        "name": "legacy.txt",
+                        "storage": "inline",
+                        "content": base64.b64encode(b"Legacy").decode("utf-8"),
+                    }
+                }
+            },
+        )
+
+        assert adapter.get_file(item_id, "legacy.txt") == b"Legacy"
+        adapter.remove_file(item_id, "legacy.txt")
+        assert adapter.list_files(item_id) == []
+
     def test_custom_output_queue_name(self, monkeypatch, tmp_path):
         """Test that RC_WORKITEM_OUTPUT_QUEUE_NAME overrides default output queue naming."""
         from pymongo import MongoClient  # type: ignore[import-not-found]